@@ -24,11 +24,25 @@ class Settings(BaseSettings):
     SUPABASE_ANON_KEY: str = Field(..., env="SUPABASE_ANON_KEY")
     SUPABASE_SERVICE_ROLE_KEY: str = Field(..., env="SUPABASE_SERVICE_ROLE_KEY")
     DATABASE_URL: str = Field(..., env="DATABASE_URL")
+    DB_WARMUP: bool = Field(default=True, env="DB_WARMUP")  # probe Supabase once at startup
+    DB_POOL_MAX: int = Field(default=25, env="DB_POOL_MAX")
+    DB_COMMAND_TIMEOUT: float = Field(default=10.0, env="DB_COMMAND_TIMEOUT")  # seconds
+    DB_CONNECT_TIMEOUT: float = Field(default=10.0, env="DB_CONNECT_TIMEOUT")  # seconds
     
     # External API keys
     GOOGLE_GEMINI_API_KEY: str = Field(..., env="GOOGLE_GEMINI_API_KEY")
     GOOGLE_GEMINI_MODEL: str = Field(default="gemini-2.0-flash-exp", env="GOOGLE_GEMINI_MODEL")
     
+    # AI feedback cache settings
+    AI_FEEDBACK_CACHE_SIZE: int = Field(default=256, env="AI_FEEDBACK_CACHE_SIZE")
+    AI_SEMANTIC_CACHE_ENABLED: bool = Field(default=False, env="AI_SEMANTIC_CACHE_ENABLED")
+    AI_SEMANTIC_CACHE_THRESHOLD: float = Field(default=0.95, env="AI_SEMANTIC_CACHE_THRESHOLD")
+    
+    # AI request batching (experimental; combines concurrent prompts into one call)
+    AI_BATCHING_ENABLED: bool = Field(default=False, env="AI_BATCHING_ENABLED")
+    AI_BATCH_MAX_SIZE: int = Field(default=8, env="AI_BATCH_MAX_SIZE")
+    AI_BATCH_WINDOW_MS: int = Field(default=20, env="AI_BATCH_WINDOW_MS")
+    
     # File upload settings
     MAX_FILE_SIZE: int = Field(default=10 * 1024 * 1024, env="MAX_FILE_SIZE")  # 10MB
     ALLOWED_FILE_TYPES: List[str] = Field(
@@ -47,6 +61,15 @@ class Settings(BaseSettings):
         env="EMBEDDING_MODEL_NAME"
     )
     NER_CONFIDENCE_THRESHOLD: float = Field(default=0.80, env="NER_CONFIDENCE_THRESHOLD")
+    # Sentence-transformers inference backend: "torch", "onnx" or "openvino". Non-torch
+    # backends need sentence-transformers>=3.2 plus onnxruntime/optimum; ONNX Runtime
+    # fuses attention and uses AVX-512/VNNI kernels on CPU
+    EMBEDDING_BACKEND: str = Field(default="torch", env="EMBEDDING_BACKEND")
+    # Store cached embeddings as int8 + scale: 4x less cache memory, ~1e-3 precision loss
+    EMBEDDING_CACHE_QUANTIZED: bool = Field(default=False, env="EMBEDDING_CACHE_QUANTIZED")
+    # Seconds an unused semantic service stays pinned before its models may be
+    # garbage collected (0 keeps it for the life of the process)
+    SEMANTIC_SERVICE_IDLE_TTL: float = Field(default=1800.0, env="SEMANTIC_SERVICE_IDLE_TTL")
     
     # Performance settings
     MAX_CONCURRENT_USERS: int = Field(default=50, env="MAX_CONCURRENT_USERS")
@@ -1,6 +1,7 @@
 """
 FastAPI application entry point for SmartResume AI Resume Analyzer
 """
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
@@ -16,6 +17,7 @@ from app.middleware.security import SecurityMiddleware
 from app.middleware.monitoring import MonitoringMiddleware
 from app.routers import health, upload, analysis, history, monitoring
 from app.services.database_service import db_service
+from app.services.semantic_service import get_semantic_service
 
 def custom_openapi():
     """Custom OpenAPI schema generation with enhanced documentation"""
@@ -228,6 +230,9 @@ async def startup_event():
         # Continue startup even if models fail to load (graceful degradation)
         logger.warning("Application starting with degraded ML capabilities")
     
+    # Warm up semantic models in the background while the server accepts traffic
+    app.state.semantic_warmup = asyncio.create_task(get_semantic_service().warmup())
+    
     # Start system resource monitoring
     try:
         await system_monitor.start_monitoring()
@@ -13,7 +13,7 @@ class BaseEntity:
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class UserProfile:
     """User profile entity matching profiles table"""
     id: UUID
@@ -23,7 +23,7 @@ class UserProfile:
     created_at: Optional[datetime] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Resume:
     """Resume entity matching resumes table"""
     id: UUID
@@ -34,7 +34,7 @@ class Resume:
     uploaded_at: Optional[datetime] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Analysis:
     """Analysis entity matching analyses table"""
     id: UUID
@@ -3,11 +3,13 @@ Resume analysis endpoints for comprehensive resume-job matching
 """
 import time
 import asyncio
+import dataclasses
 from datetime import datetime
 from uuid import uuid4, UUID
 from typing import Optional
 from fastapi import APIRouter, HTTPException, Depends, Request
 
+from app.config import settings
 from app.utils.logger import get_logger
 from app.models.requests import AnalysisRequest
 from app.models.responses import AnalysisResponse
@@ -215,9 +217,15 @@ async def analyze_resume(
         # Step 4: Store analysis results
         processing_time = time.time() - start_time
         
-        # Convert objects to JSON strings for database storage
+        # Convert objects to JSON strings for database storage. The raw model
+        # output is only kept in debug mode to cut bytes stored and sent.
         import json
-        ai_feedback_json = json.dumps(ai_feedback.dict() if hasattr(ai_feedback, 'dict') else ai_feedback.__dict__)
+        if hasattr(ai_feedback, 'to_dict'):
+            ai_feedback_dict = ai_feedback.to_dict(include_raw_response=settings.DEBUG)
+        else:
+            # Plain feedback entities (e.g. app.models.entities.AIFeedback)
+            ai_feedback_dict = dataclasses.asdict(ai_feedback)
+        ai_feedback_json = json.dumps(ai_feedback_dict)
         matched_keywords_json = json.dumps(compatibility_analysis.matched_keywords)
         missing_keywords_json = json.dumps(compatibility_analysis.missing_keywords)
         
@@ -245,21 +253,9 @@ async def analyze_resume(
         )
         
         # Store analysis with enhanced error handling
-        print(f"DEBUG: About to store analysis for user {user_id}")
         try:
             analysis_id = await db_service.store_analysis(analysis_result)
-            print(f"DEBUG: Analysis stored successfully with ID: {analysis_id}")
-            
-            # Verify the analysis was actually saved
-            verification = await db_service.get_analysis_by_id(UUID(analysis_id))
-            if not verification:
-                print(f"DEBUG: CRITICAL ERROR - Analysis {analysis_id} not found after creation!")
-                raise DatabaseError("Analysis was created but cannot be retrieved")
-            else:
-                print(f"DEBUG: Analysis verification successful - found analysis with score {verification.match_score}")
-            
         except Exception as e:
-            print(f"DEBUG: CRITICAL ERROR storing analysis: {e}")
             logger.error("Critical error storing analysis", error=str(e), user_id=user_id)
             raise
         
@@ -272,9 +268,6 @@ async def analyze_resume(
             processing_time=processing_time
         )
         
-        # Convert AIFeedback object to dictionary for response
-        ai_feedback_dict = ai_feedback.dict() if hasattr(ai_feedback, 'dict') else ai_feedback.__dict__
-        
         return AnalysisResponse(
             analysis_id=UUID(analysis_id),
             match_score=compatibility_analysis.match_score,
@@ -488,20 +481,15 @@ async def get_analysis(
         
         # Note: User authorization check temporarily disabled for testing
         
-        # Parse JSON fields back to objects
-        import json
-        ai_feedback_dict = json.loads(analysis.ai_feedback) if isinstance(analysis.ai_feedback, str) else analysis.ai_feedback
-        matched_keywords = json.loads(analysis.matched_keywords) if isinstance(analysis.matched_keywords, str) else analysis.matched_keywords
-        missing_keywords = json.loads(analysis.missing_keywords) if isinstance(analysis.missing_keywords, str) else analysis.missing_keywords
-        
-        # Return analysis data in the format expected by frontend
+        # Return analysis data in the format expected by frontend (JSON columns
+        # are already decoded by the database layer)
         response_data = {
             "id": str(analysis.id),
             "job_title": analysis.job_title,
             "match_score": analysis.match_score,
-            "ai_feedback": ai_feedback_dict,
-            "matched_keywords": matched_keywords,
-            "missing_keywords": missing_keywords,
+            "ai_feedback": analysis.ai_feedback,
+            "matched_keywords": analysis.matched_keywords,
+            "missing_keywords": analysis.missing_keywords,
             "created_at": analysis.created_at if isinstance(analysis.created_at, str) else (analysis.created_at.isoformat() if analysis.created_at else None)
         }
         
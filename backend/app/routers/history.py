@@ -45,15 +45,13 @@ async def get_user_analyses(
         # Calculate offset for pagination
         offset = (page - 1) * page_size
         
-        # Get analyses and total count
-        analyses = await db_service.get_user_analyses(
+        # Get analyses and total count in one round-trip
+        analyses, total_count = await db_service.get_user_analyses_page(
             user_id=UUID(user_id),
             limit=page_size,
             offset=offset
         )
         
-        total_count = await db_service.analyses.get_user_analyses_count(UUID(user_id))
-        
         # Format analyses for response
         analysis_list = [
             {
@@ -2,15 +2,22 @@
 AI feedback generation service using Google Gemini API
 """
 import asyncio
+import copy
+import hashlib
 import json
+import logging
 import re
 import time
-from typing import Dict, Any, Optional, List
-from dataclasses import dataclass
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Tuple, Collection, Iterator, Callable, Awaitable
+from dataclasses import dataclass, field
 from enum import Enum
 
+import numpy as np
+
 from google import genai
 from google.genai import types as genai_types
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, field_validator
 
 from app.config import settings
 from app.core.exceptions import AIServiceError, APIRateLimitError
@@ -19,6 +26,181 @@ from app.utils.logger import get_logger
 logger = get_logger(__name__)
 
 
+# Static feedback served when the Gemini API key is not configured, serialized
+# once at import so the simulated path skips hashing and JSON extraction.
+_SIMULATED_FEEDBACK: Dict[str, Any] = {
+    "overall_assessment": "This is a simulated analysis since the Google Gemini API key is not configured. The resume shows good potential with relevant skills and experience. Consider adding more specific keywords and quantifiable achievements to improve ATS compatibility.",
+    "strengths": [
+        "Relevant technical skills identified",
+        "Professional experience demonstrated",
+        "Clear career progression shown"
+    ],
+    "priority_improvements": [
+        {
+            "category": "Skills Enhancement",
+            "priority": "High",
+            "recommendation": "Add more specific technical keywords that match the job description",
+            "impact": "Improves ATS keyword matching and recruiter visibility"
+        },
+        {
+            "category": "Experience Quantification",
+            "priority": "High",
+            "recommendation": "Include specific metrics and achievements in your experience descriptions",
+            "impact": "Demonstrates concrete value and results to employers"
+        },
+        {
+            "category": "Format Optimization",
+            "priority": "Medium",
+            "recommendation": "Ensure consistent formatting and use standard section headers",
+            "impact": "Improves ATS parsing and professional appearance"
+        }
+    ],
+    "match_score_interpretation": "This is a simulated score. Configure the Google Gemini API key for accurate AI-powered analysis.",
+    "missing_keywords_analysis": {
+        "critical_missing": ["Configure API key for detailed analysis"],
+        "suggestions": "Set up Google Gemini API key in environment variables for comprehensive keyword analysis"
+    },
+    "ats_optimization_tips": [
+        "Use standard section headers (Experience, Education, Skills)",
+        "Include relevant keywords from the job description naturally in your content",
+        "Save resume in both PDF and Word formats for different ATS systems",
+        "Configure Google Gemini API key for personalized ATS optimization recommendations"
+    ]
+}
+_SIMULATED_FEEDBACK_JSON = json.dumps(_SIMULATED_FEEDBACK, separators=(',', ':'))
+
+
+def _prompt_key(prompt: str) -> str:
+    """Stable SHA-256 key identifying a prompt"""
+    return hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+
+
+# Characters the brace scanner must inspect outside and inside JSON strings
+_STRUCTURAL_CHARS = re.compile(r'[{}"]')
+_STRING_SPECIAL_CHARS = re.compile(r'["\\]')
+_OPEN_BRACE = re.compile(r'\{')
+
+
+class JsonSpanScanner:
+    """Incrementally locates the first balanced top-level JSON object in streamed text"""
+    
+    def __init__(self):
+        self._parts: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self.complete = False
+    
+    def feed(self, chunk: str) -> bool:
+        """
+        Consume the next chunk of text
+        
+        Args:
+            chunk: Next piece of the streamed response
+            
+        Returns:
+            True once a complete JSON object has been observed
+        """
+        if self.complete:
+            return True
+        
+        start = 0 if self._depth else chunk.find('{')
+        if start == -1:
+            return False
+        
+        # Jump between structural characters instead of stepping through every
+        # character; regex search runs in C over the skipped stretches
+        pos = start
+        end = len(chunk)
+        while pos < end:
+            if self._escape:
+                self._escape = False
+                pos += 1
+                continue
+            
+            if self._in_string:
+                match = _STRING_SPECIAL_CHARS.search(chunk, pos)
+                if match is None:
+                    break
+                pos = match.end()
+                if match.group() == '\\':
+                    self._escape = True
+                else:
+                    self._in_string = False
+                continue
+            
+            match = _STRUCTURAL_CHARS.search(chunk, pos)
+            if match is None:
+                break
+            pos = match.end()
+            ch = match.group()
+            if ch == '"':
+                self._in_string = True
+            elif ch == '{':
+                self._depth += 1
+            else:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._parts.append(chunk[start:pos])
+                    self.complete = True
+                    return True
+        
+        self._parts.append(chunk[start:])
+        return False
+    
+    @property
+    def span(self) -> Optional[str]:
+        """Text of the completed JSON object, or None if still incomplete"""
+        return ''.join(self._parts) if self.complete else None
+
+
+def _find_json_spans(text: str) -> List[str]:
+    """
+    Find every balanced top-level JSON object in text
+    
+    A single pass with a stack of open braces, so unlike a nested-brace regex
+    this cannot backtrack: adversarial or deeply nested output is scanned in
+    linear time. A brace that never closes (e.g. a stray '{' in leading prose)
+    does not hide the objects after it; those are reported as top-level.
+    """
+    # (start, end, position of the enclosing open brace or None)
+    closed: List[Tuple[int, int, Optional[int]]] = []
+    stack: List[int] = []
+    in_string = False
+    pos = 0
+    while True:
+        if in_string:
+            match = _STRING_SPECIAL_CHARS.search(text, pos)
+            if match is None:
+                break
+            if match.group() == '\\':
+                pos = match.end() + 1  # skip the escaped character
+            else:
+                pos = match.end()
+                in_string = False
+            continue
+        
+        # Outside any object only an opening brace matters
+        match = _STRUCTURAL_CHARS.search(text, pos) if stack else _OPEN_BRACE.search(text, pos)
+        if match is None:
+            break
+        pos = match.end()
+        ch = match.group()
+        if ch == '"':
+            in_string = True
+        elif ch == '{':
+            stack.append(match.start())
+        else:
+            start = stack.pop()
+            closed.append((start, pos, stack[-1] if stack else None))
+    
+    unclosed = set(stack)
+    return [
+        text[start:end] for start, end, parent in closed
+        if parent is None or parent in unclosed
+    ]
+
+
 class CircuitBreakerState(Enum):
     """Circuit breaker states"""
     CLOSED = "closed"
@@ -37,19 +219,22 @@ class CircuitBreakerConfig:
 class CircuitBreaker:
     """Circuit breaker pattern implementation for API reliability"""
     
+    __slots__ = ("config", "state", "failure_count", "success_count", "last_failure_ns", "_recovery_ns")
+    
     def __init__(self, config: CircuitBreakerConfig):
         self.config = config
         self.state = CircuitBreakerState.CLOSED
         self.failure_count = 0
         self.success_count = 0
-        self.last_failure_time = 0
+        self.last_failure_ns = 0  # time.monotonic_ns() of the last failure
+        self._recovery_ns = int(config.recovery_timeout * 1_000_000_000)
     
     def can_execute(self) -> bool:
         """Check if request can be executed based on circuit breaker state"""
         if self.state == CircuitBreakerState.CLOSED:
             return True
         elif self.state == CircuitBreakerState.OPEN:
-            if time.time() - self.last_failure_time >= self.config.recovery_timeout:
+            if time.monotonic_ns() - self.last_failure_ns >= self._recovery_ns:
                 self.state = CircuitBreakerState.HALF_OPEN
                 self.success_count = 0
                 logger.info("circuit_breaker_half_open", state="half_open")
@@ -73,7 +258,7 @@ class CircuitBreaker:
     def record_failure(self):
         """Record failed API call"""
         self.failure_count += 1
-        self.last_failure_time = time.time()
+        self.last_failure_ns = time.monotonic_ns()
         
         if self.state == CircuitBreakerState.CLOSED:
             if self.failure_count >= self.config.failure_threshold:
@@ -101,19 +286,48 @@ class GeminiClient:
         # Initialize circuit breaker
         self.circuit_breaker = CircuitBreaker(CircuitBreakerConfig())
         
-        # Check if API key is properly configured
-        if not self.api_key or self.api_key == "your-google-gemini-api-key":
-            logger.warning("Google Gemini API key not configured - AI feedback will be simulated")
-            self.client = None
+        # In-flight requests keyed by prompt hash (single-flight de-duplication)
+        self._inflight: Dict[str, asyncio.Future] = {}  # shared request tasks by prompt key
+        
+        # SDK client is created lazily by initialize() so that constructing
+        # this object never blocks the event loop
+        self.client = None
+        self._initialized = False
+        self._init_lock = asyncio.Lock()
+    
+    async def initialize(self) -> None:
+        """
+        Create the Gemini SDK client off the event loop
+        
+        Safe to call repeatedly; only the first call does any work. A client
+        assigned before initialization is kept as-is.
+        """
+        if self._initialized:
             return
         
-        # Configure Gemini API with new SDK
-        try:
-            self.client = genai.Client(api_key=self.api_key)
-            logger.info("gemini_client_initialized", model_name=self.model_name)
-        except Exception as e:
-            logger.error("Failed to configure Gemini API", error=str(e))
-            self.client = None
+        async with self._init_lock:
+            if self._initialized:
+                return
+            
+            if self.client is None:
+                # Check if API key is properly configured
+                if not self.api_key or self.api_key == "your-google-gemini-api-key":
+                    logger.warning("Google Gemini API key not configured - AI feedback will be simulated")
+                else:
+                    # Configure Gemini API with new SDK
+                    try:
+                        loop = asyncio.get_running_loop()
+                        self.client = await loop.run_in_executor(None, self._create_client)
+                        logger.info("gemini_client_initialized", model_name=self.model_name)
+                    except Exception as e:
+                        logger.error("Failed to configure Gemini API", error=str(e))
+                        self.client = None
+            
+            self._initialized = True
+    
+    def _create_client(self) -> "genai.Client":
+        """Blocking SDK client construction, run in the default executor"""
+        return genai.Client(api_key=self.api_key)
     
     async def generate_response(self, prompt: str) -> str:
         """
@@ -129,11 +343,61 @@ class GeminiClient:
             AIServiceError: If API call fails after all retries
             APIRateLimitError: If rate limit is exceeded
         """
-        # Fallback if API key is not configured
+        response_text, _ = await self.generate_response_with_json(prompt)
+        return response_text
+    
+    async def generate_response_with_json(self, prompt: str) -> Tuple[str, Optional[str]]:
+        """
+        Generate response and the JSON object embedded in it
+        
+        The JSON object's span is located while the response is still
+        streaming. Concurrent calls with an identical prompt share a single
+        in-flight request instead of each issuing their own API call.
+        
+        Args:
+            prompt: The prompt to send to Gemini API
+            
+        Returns:
+            Tuple of (response text, text of the first JSON object or None)
+            
+        Raises:
+            AIServiceError: If API call fails after all retries
+            APIRateLimitError: If rate limit is exceeded
+        """
+        if not self._initialized:
+            await self.initialize()
+        
+        # Simulated responses are static, so skip hashing and de-duplication
         if self.client is None:
             logger.info("Using simulated AI feedback - API key not configured")
-            return self._generate_simulated_feedback(prompt)
+            simulated = self._generate_simulated_feedback(prompt)
+            return simulated, simulated
         
+        key = _prompt_key(prompt)
+        
+        # The shared call runs as its own task and every caller, the first
+        # included, awaits it through a shield: one caller being cancelled
+        # (client disconnect, timeout) cannot cancel the others' result
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._generate_response(prompt))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget_inflight(key, done))
+        else:
+            logger.info("gemini_request_coalesced", prompt_length=len(prompt))
+        return await asyncio.shield(task)
+    
+    def _forget_inflight(self, key: str, task: asyncio.Future) -> None:
+        """Drop a settled shared request from the in-flight table"""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark a failure as retrieved so it is not reported when every caller
+        # had already gone away
+        if not task.cancelled():
+            task.exception()
+    
+    async def _generate_response(self, prompt: str) -> Tuple[str, Optional[str]]:
+        """Issue a single Gemini request with retries (no de-duplication)"""
         if not self.circuit_breaker.can_execute():
             raise AIServiceError(
                 message="Circuit breaker is open, API temporarily unavailable",
@@ -152,15 +416,11 @@ class GeminiClient:
                     prompt_length=len(prompt)
                 )
                 
-                # Generate response using new SDK
-                response = await asyncio.to_thread(
-                    self.client.models.generate_content,
-                    model=self.model_name,
-                    contents=prompt
-                )
+                # Stream the response so JSON parsing overlaps the transfer
+                response_text, json_span = await self._stream_content(prompt)
                 
                 # Validate response
-                if not response or not response.text:
+                if not response_text:
                     raise AIServiceError(
                         message="Empty response from Gemini API",
                         service_name="gemini",
@@ -173,10 +433,11 @@ class GeminiClient:
                 logger.info(
                     "gemini_api_request_success",
                     attempt=attempt + 1,
-                    response_length=len(response.text)
+                    response_length=len(response_text),
+                    json_found=json_span is not None
                 )
                 
-                return response.text
+                return response_text, json_span
                 
             except Exception as e:
                 last_exception = e
@@ -243,6 +504,33 @@ class GeminiClient:
             }
         )
     
+    async def _stream_content(self, prompt: str) -> Tuple[str, Optional[str]]:
+        """
+        Stream a response from Gemini, locating its JSON object as chunks arrive
+        
+        Args:
+            prompt: The prompt to send to Gemini API
+            
+        Returns:
+            Tuple of (full response text, text of the first JSON object or None)
+        """
+        scanner = JsonSpanScanner()
+        parts: List[str] = []
+        
+        stream = await self.client.aio.models.generate_content_stream(
+            model=self.model_name,
+            contents=prompt
+        )
+        async for chunk in stream:
+            text = chunk.text
+            if not text:
+                continue
+            parts.append(text)
+            if not scanner.complete:
+                scanner.feed(text)
+        
+        return ''.join(parts), scanner.span
+    
     async def health_check(self) -> Dict[str, Any]:
         """
         Perform health check on Gemini API
@@ -275,62 +563,55 @@ class GeminiClient:
     
     def _generate_simulated_feedback(self, prompt: str) -> str:
         """Generate simulated AI feedback when API key is not configured"""
-        return """{
-            "overall_assessment": "This is a simulated analysis since the Google Gemini API key is not configured. The resume shows good potential with relevant skills and experience. Consider adding more specific keywords and quantifiable achievements to improve ATS compatibility.",
-            "strengths": [
-                "Relevant technical skills identified",
-                "Professional experience demonstrated",
-                "Clear career progression shown"
-            ],
-            "recommendations": [
-                {
-                    "category": "Skills Enhancement",
-                    "priority": "high",
-                    "suggestion": "Add more specific technical keywords that match the job description",
-                    "impact": "Improves ATS keyword matching and recruiter visibility"
-                },
-                {
-                    "category": "Experience Quantification",
-                    "priority": "high", 
-                    "suggestion": "Include specific metrics and achievements in your experience descriptions",
-                    "impact": "Demonstrates concrete value and results to employers"
-                },
-                {
-                    "category": "Format Optimization",
-                    "priority": "medium",
-                    "suggestion": "Ensure consistent formatting and use standard section headers",
-                    "impact": "Improves ATS parsing and professional appearance"
-                }
-            ],
-            "match_score_interpretation": "This is a simulated score. Configure the Google Gemini API key for accurate AI-powered analysis.",
-            "missing_keywords_analysis": {
-                "critical_missing": ["Configure API key for detailed analysis"],
-                "suggestions": "Set up Google Gemini API key in environment variables for comprehensive keyword analysis"
-            },
-            "ats_optimization_tips": [
-                "Use standard section headers (Experience, Education, Skills)",
-                "Include relevant keywords from the job description naturally in your content",
-                "Save resume in both PDF and Word formats for different ATS systems",
-                "Configure Google Gemini API key for personalized ATS optimization recommendations"
-            ]
-        }"""
+        return _SIMULATED_FEEDBACK_JSON
 
 
 # Global Gemini client instance
-gemini_client = GeminiClient()
+_gemini_client: Optional[GeminiClient] = None
 
 
-@dataclass
+async def get_gemini_client() -> GeminiClient:
+    """
+    Get the shared Gemini client, initializing it on first use
+    
+    Returns:
+        Initialized GeminiClient instance
+    """
+    global _gemini_client
+    if _gemini_client is None:
+        _gemini_client = GeminiClient()
+    await _gemini_client.initialize()
+    return _gemini_client
+
+
+@dataclass(frozen=True, slots=True)
 class AnalysisContext:
-    """Context data for AI feedback generation"""
+    """
+    Immutable context data for AI feedback generation.
+
+    Keyword lists are stored as tuples and the slices used by the prompt
+    builders are taken once at construction.
+    """
     resume_entities: Dict[str, Any]
     match_score: float
-    matched_keywords: List[str]
-    missing_keywords: List[str]
+    matched_keywords: Tuple[str, ...]
+    missing_keywords: Tuple[str, ...]
     semantic_similarity: float
     keyword_coverage: float
     job_description: str
     resume_text: str
+    matched_top15: Tuple[str, ...] = field(init=False, repr=False)
+    missing_top15: Tuple[str, ...] = field(init=False, repr=False)
+    missing_top5: Tuple[str, ...] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        matched = tuple(self.matched_keywords)
+        missing = tuple(self.missing_keywords)
+        object.__setattr__(self, 'matched_keywords', matched)
+        object.__setattr__(self, 'missing_keywords', missing)
+        object.__setattr__(self, 'matched_top15', matched[:15])
+        object.__setattr__(self, 'missing_top15', missing[:15])
+        object.__setattr__(self, 'missing_top5', missing[:5])
 
 
 class PromptEngine:
@@ -338,7 +619,21 @@ class PromptEngine:
     
     def __init__(self):
         self.persona_prompt = self._build_persona_prompt()
+        self.reasoning_prompt = self._build_reasoning_prompt()
+        self.output_format = self._build_output_format()
         self.few_shot_examples = self._build_few_shot_examples()
+        
+        # Constant text around the per-request context section, joined once
+        self._prompt_head = f"{self.persona_prompt}\n\n"
+        self._prompt_tail = f"""
+
+{self.reasoning_prompt}
+
+{self.output_format}
+
+{self.few_shot_examples}
+
+Now, please analyze the provided resume against the job description and provide your feedback in the specified JSON format:"""
     
     def _build_persona_prompt(self) -> str:
         """Build persona priming for career coach expertise simulation"""
@@ -360,6 +655,63 @@ Your approach is:
 
 You provide feedback that is honest but supportive, helping candidates understand both their strengths and areas for improvement."""
     
+    def _build_reasoning_prompt(self) -> str:
+        """Build chain-of-thought reasoning instructions"""
+        return """
+ANALYSIS INSTRUCTIONS:
+=====================
+
+Please analyze this resume against the job description using the following chain-of-thought approach:
+
+1. COMPATIBILITY ASSESSMENT:
+   - Evaluate the match score and what it indicates about overall fit
+   - Consider both semantic similarity and keyword coverage
+   - Identify the strongest alignment areas
+
+2. STRENGTHS IDENTIFICATION:
+   - What skills and experiences align well with the job requirements?
+   - What makes this candidate competitive?
+   - What unique value do they bring?
+
+3. GAP ANALYSIS:
+   - What critical requirements are missing or underrepresented?
+   - Which missing keywords represent the biggest opportunities?
+   - What experience gaps need to be addressed?
+
+4. PRIORITIZED RECOMMENDATIONS:
+   - What are the highest-impact improvements they could make?
+   - Which changes would most improve their ATS compatibility?
+   - What specific actions should they take?
+
+5. ATS OPTIMIZATION:
+   - How can they better align with automated screening systems?
+   - What formatting or keyword improvements are needed?
+   - How can they improve their keyword density and relevance?
+"""
+    
+    def _build_output_format(self) -> str:
+        """Build output format specification"""
+        return """
+OUTPUT REQUIREMENTS:
+===================
+
+Provide your analysis as a valid JSON object with the following structure:
+- overall_assessment: A comprehensive 2-3 sentence summary
+- match_score_interpretation: What the match score means for their candidacy
+- strengths: Array of 3-5 key strengths with specific examples
+- priority_improvements: Array of 3-5 improvement recommendations, each with:
+  - category: The type of improvement (Skills, Experience, Formatting, etc.)
+  - priority: Critical/High/Medium/Low
+  - recommendation: Specific, actionable advice
+  - impact: Why this improvement matters
+- missing_keywords_analysis: Object with:
+  - critical_missing: Array of most important missing keywords
+  - suggestions: How to address the missing keywords
+- ats_optimization_tips: Array of 3-5 specific ATS improvement suggestions
+
+Ensure your response is valid JSON that can be parsed programmatically.
+"""
+    
     def _build_few_shot_examples(self) -> str:
         """Create few-shot learning examples for consistent JSON output formatting"""
         return """Here are examples of the expected JSON response format:
@@ -464,82 +816,14 @@ Extracted Resume Information:
 - Education: {', '.join(education[:3]) if education else 'None detected'}
 
 Keyword Analysis:
-- Matched Keywords ({len(context.matched_keywords)}): {', '.join(context.matched_keywords[:15])}
-- Missing Keywords ({len(context.missing_keywords)}): {', '.join(context.missing_keywords[:15])}
+- Matched Keywords ({len(context.matched_keywords)}): {', '.join(context.matched_top15)}
+- Missing Keywords ({len(context.missing_keywords)}): {', '.join(context.missing_top15)}
 
 Job Description (First 500 chars):
 {context.job_description[:500]}...
 """
         
-        # Build chain-of-thought reasoning prompt
-        reasoning_prompt = """
-ANALYSIS INSTRUCTIONS:
-=====================
-
-Please analyze this resume against the job description using the following chain-of-thought approach:
-
-1. COMPATIBILITY ASSESSMENT:
-   - Evaluate the match score and what it indicates about overall fit
-   - Consider both semantic similarity and keyword coverage
-   - Identify the strongest alignment areas
-
-2. STRENGTHS IDENTIFICATION:
-   - What skills and experiences align well with the job requirements?
-   - What makes this candidate competitive?
-   - What unique value do they bring?
-
-3. GAP ANALYSIS:
-   - What critical requirements are missing or underrepresented?
-   - Which missing keywords represent the biggest opportunities?
-   - What experience gaps need to be addressed?
-
-4. PRIORITIZED RECOMMENDATIONS:
-   - What are the highest-impact improvements they could make?
-   - Which changes would most improve their ATS compatibility?
-   - What specific actions should they take?
-
-5. ATS OPTIMIZATION:
-   - How can they better align with automated screening systems?
-   - What formatting or keyword improvements are needed?
-   - How can they improve their keyword density and relevance?
-"""
-        
-        # Build output format specification
-        output_format = """
-OUTPUT REQUIREMENTS:
-===================
-
-Provide your analysis as a valid JSON object with the following structure:
-- overall_assessment: A comprehensive 2-3 sentence summary
-- match_score_interpretation: What the match score means for their candidacy
-- strengths: Array of 3-5 key strengths with specific examples
-- priority_improvements: Array of 3-5 improvement recommendations, each with:
-  - category: The type of improvement (Skills, Experience, Formatting, etc.)
-  - priority: Critical/High/Medium/Low
-  - recommendation: Specific, actionable advice
-  - impact: Why this improvement matters
-- missing_keywords_analysis: Object with:
-  - critical_missing: Array of most important missing keywords
-  - suggestions: How to address the missing keywords
-- ats_optimization_tips: Array of 3-5 specific ATS improvement suggestions
-
-Ensure your response is valid JSON that can be parsed programmatically.
-"""
-        
-        # Combine all sections
-        complete_prompt = f"""{self.persona_prompt}
-
-{context_section}
-
-{reasoning_prompt}
-
-{output_format}
-
-{self.few_shot_examples}
-
-Now, please analyze the provided resume against the job description and provide your feedback in the specified JSON format:"""
-        
-        return complete_prompt
+        return self._prompt_head + context_section + self._prompt_tail
     
     def build_fallback_prompt(self, context: AnalysisContext) -> str:
         """
@@ -555,7 +839,7 @@ Now, please analyze the provided resume against the job description and provide
 
 Key Info:
 - Skills found: {', '.join(context.resume_entities.get('skills', [])[:5])}
-- Missing keywords: {', '.join(context.missing_keywords[:5])}
+- Missing keywords: {', '.join(context.missing_top5)}
 
 Provide JSON with:
 - overall_assessment: Brief summary
@@ -577,40 +861,162 @@ class AIFeedback:
     ats_optimization_tips: List[str]
     raw_response: Optional[str] = None
     parsing_confidence: float = 1.0
+    
+    def to_dict(self, include_raw_response: bool = False) -> Dict[str, Any]:
+        """
+        Convert to a JSON-ready dictionary
+        
+        Args:
+            include_raw_response: Include the unparsed model output, which is
+                often several KB and only useful when debugging
+        """
+        data = {
+            'overall_assessment': self.overall_assessment,
+            'match_score_interpretation': self.match_score_interpretation,
+            'strengths': self.strengths,
+            'priority_improvements': self.priority_improvements,
+            'missing_keywords_analysis': self.missing_keywords_analysis,
+            'ats_optimization_tips': self.ats_optimization_tips,
+            'parsing_confidence': self.parsing_confidence,
+        }
+        if include_raw_response:
+            data['raw_response'] = self.raw_response
+        return data
+
+
+# Confidence assigned to placeholder feedback when parsing fails
+MINIMAL_FEEDBACK_CONFIDENCE = 0.1
+
+
+def _coerce_str_list(value: Any) -> Any:
+    """Wrap a bare string in a list and stringify non-string items"""
+    if type(value) is list:
+        # Fast path: well-formed responses already hold a list of strings
+        if all(type(item) is str for item in value):
+            return value
+        return [item if isinstance(item, str) else str(item) for item in value]
+    if isinstance(value, str):
+        return [value]
+    return value
+
+
+class PriorityImprovement(BaseModel):
+    """Single prioritized recommendation in AI feedback"""
+    model_config = ConfigDict(coerce_numbers_to_str=True)
+    
+    category: str = 'General'
+    priority: str = 'Medium'
+    recommendation: str
+    impact: str = 'Will improve resume quality'
+
+
+class AIFeedbackModel(BaseModel):
+    """Validation schema for the feedback JSON returned by the model"""
+    model_config = ConfigDict(coerce_numbers_to_str=True)
+    
+    overall_assessment: str
+    strengths: List[str]
+    priority_improvements: List[PriorityImprovement]
+    match_score_interpretation: str = ''
+    missing_keywords_analysis: Dict[str, Any] = Field(default_factory=dict)
+    ats_optimization_tips: List[str] = Field(default_factory=list)
+    
+    @field_validator('overall_assessment', mode='before')
+    @classmethod
+    def _join_assessment(cls, value: Any) -> Any:
+        if type(value) is str:
+            return value
+        if isinstance(value, list):
+            return '. '.join(str(item) for item in value)
+        return value
+    
+    @field_validator('strengths', 'ats_optimization_tips', mode='before')
+    @classmethod
+    def _coerce_lists(cls, value: Any) -> Any:
+        return _coerce_str_list(value)
+    
+    @field_validator('priority_improvements', mode='before')
+    @classmethod
+    def _normalize_improvements(cls, value: Any) -> Any:
+        if isinstance(value, str):
+            value = [value]
+        if not isinstance(value, list):
+            return value
+        
+        # Fast path: every entry is already a dict the model can validate
+        if all(type(imp) is dict and 'recommendation' in imp for imp in value):
+            return value
+        
+        normalized = []
+        for imp in value:
+            if isinstance(imp, dict):
+                if 'recommendation' not in imp:
+                    imp = {**imp, 'recommendation': str(imp)}
+                normalized.append(imp)
+            elif isinstance(imp, str):
+                normalized.append({'recommendation': imp})
+        return normalized
+
+
+# pydantic-core compiles a validator specialized to this schema once, when the
+# class is created; bind it directly to skip the BaseModel classmethod wrappers
+_validate_feedback = AIFeedbackModel.__pydantic_validator__.validate_python
+_validate_feedback_json = AIFeedbackModel.__pydantic_validator__.validate_json
+
+# Feedback field names, derived once from the schema
+_REQUIRED_FIELDS: Tuple[str, ...] = tuple(
+    name for name, info in AIFeedbackModel.model_fields.items() if info.is_required()
+)
+_OPTIONAL_FIELDS: Tuple[str, ...] = tuple(
+    name for name, info in AIFeedbackModel.model_fields.items() if not info.is_required()
+)
+
+
+def _is_json_syntax_error(error: ValidationError) -> bool:
+    """Whether validation failed because the input was not well-formed JSON"""
+    return error.errors()[0]['type'] == 'json_invalid'
 
 
 class ResponseParser:
     """Parser for extracting and validating JSON from AI responses"""
     
     def __init__(self):
-        # JSON extraction patterns
-        self.json_patterns = [
-            r'```json\s*(\{.*?\})\s*```',  # JSON in code blocks
-            r'```\s*(\{.*?\})\s*```',      # JSON in generic code blocks
-            r'(\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\})',  # Balanced braces
-            r'(\{.*\})',                    # Simple JSON object
-        ]
-        
-        # Required fields for validation
-        self.required_fields = {
-            'overall_assessment': str,
-            'strengths': list,
-            'priority_improvements': list,
-        }
+        # JSON extraction strategies, tried in order (pattern_0 .. pattern_3)
+        self.json_strategies = (
+            'json_code_block',
+            'generic_code_block',
+            'balanced_braces',
+            'simple_object',
+        )
+        flags = re.DOTALL | re.IGNORECASE
+        # Both code block strategies come from a single scan; group 1 marks json blocks
+        self._code_block_pattern = re.compile(r'```(json)?\s*(\{.*?\})\s*```', flags)
+        self._simple_object_pattern = re.compile(r'(\{.*\})', flags)
         
-        # Optional fields with defaults
-        self.optional_fields = {
-            'match_score_interpretation': '',
-            'missing_keywords_analysis': {},
-            'ats_optimization_tips': [],
+        # Precomputed confidence scoring tables
+        self._required_names = frozenset(_REQUIRED_FIELDS)
+        self._optional_names = frozenset(_OPTIONAL_FIELDS)
+        self._required_weight = 0.3 / len(_REQUIRED_FIELDS)
+        self._optional_weight = 0.2 / len(_OPTIONAL_FIELDS)
+        self._method_bonus = {
+            'pattern_0': 0.4,   # JSON in code blocks
+            'pattern_1': 0.3,   # Generic code blocks
+            'pattern_2': 0.2,   # Balanced braces
+            'stream': 0.2,      # Balanced braces located while streaming
+            'fallback': -0.2,   # Text parsing (base confidence 0.3)
         }
     
-    def parse_response(self, response_text: str) -> AIFeedback:
+    def parse_response(
+        self,
+        response_text: str,
+        json_span: Optional[str] = None
+    ) -> AIFeedback:
         """
         Parse AI response and extract structured feedback
         
         Args:
             response_text: Raw response from AI service
+            json_span: Text of the JSON object located while streaming, if any
             
         Returns:
             Structured AIFeedback object
@@ -620,69 +1026,114 @@ class ResponseParser:
         """
         logger.info(
             "parsing_ai_response",
-            response_length=len(response_text),
-            response_preview=response_text[:200]
+            response_length=len(response_text)
         )
         
-        # Try to extract JSON using different patterns
-        extracted_json = None
+        feedback_model: Optional[AIFeedbackModel] = None
         parsing_method = None
         
-        for i, pattern in enumerate(self.json_patterns):
-            matches = re.findall(pattern, response_text, re.DOTALL | re.IGNORECASE)
-            if matches:
-                # Try each match until we find valid JSON
-                for match in matches:
-                    try:
-                        extracted_json = json.loads(match)
-                        parsing_method = f"pattern_{i}"
-                        logger.info(
-                            "json_extraction_success",
-                            method=parsing_method,
-                            pattern_index=i
-                        )
-                        break
-                    except json.JSONDecodeError:
-                        continue
-                
-                if extracted_json:
-                    break
-        
-        # If no JSON found, try fallback parsing
-        if not extracted_json:
-            extracted_json = self._fallback_parsing(response_text)
-            parsing_method = "fallback"
-        
-        # If still no JSON, create minimal response
-        if not extracted_json:
-            logger.warning(
-                "json_parsing_failed",
-                response_text=response_text[:500]
-            )
-            return self._create_minimal_feedback(response_text)
-        
-        # Validate and structure the response
         try:
-            validated_feedback = self._validate_and_structure(extracted_json, response_text)
-            validated_feedback.parsing_confidence = self._calculate_confidence(
-                extracted_json, parsing_method
-            )
+            # Decode and validate the span located while streaming in one pass
+            if json_span:
+                try:
+                    feedback_model = _validate_feedback_json(json_span)
+                    parsing_method = "stream"
+                except ValidationError as e:
+                    if not _is_json_syntax_error(e):
+                        raise
             
-            logger.info(
-                "response_parsing_success",
-                method=parsing_method,
-                confidence=validated_feedback.parsing_confidence
-            )
-            
-            return validated_feedback
+            if feedback_model is None:
+                feedback_model, parsing_method = self._extract_model(response_text)
             
-        except Exception as e:
+            # If no JSON found, try fallback parsing
+            if feedback_model is None:
+                fallback_data = self._fallback_parsing(response_text)
+                if fallback_data:
+                    feedback_model = _validate_feedback(fallback_data)
+                    parsing_method = "fallback"
+        except ValueError as e:
             logger.warning(
                 "response_validation_failed",
                 error=str(e),
-                extracted_json=extracted_json
+                method=parsing_method
             )
             return self._create_minimal_feedback(response_text)
+        
+        # If still no JSON, create minimal response
+        if feedback_model is None:
+            if logger.isEnabledFor(logging.WARNING):
+                logger.warning(
+                    "json_parsing_failed",
+                    response_text=response_text[:500]
+                )
+            return self._create_minimal_feedback(response_text)
+        
+        validated_feedback = self._to_feedback(feedback_model, response_text)
+        validated_feedback.parsing_confidence = self._calculate_confidence(
+            feedback_model.model_fields_set, parsing_method
+        )
+        
+        logger.info(
+            "response_parsing_success",
+            method=parsing_method,
+            confidence=validated_feedback.parsing_confidence
+        )
+        
+        return validated_feedback
+    
+    def _extract_model(self, response_text: str) -> Tuple[Optional[AIFeedbackModel], Optional[str]]:
+        """
+        Find the first JSON candidate in the response and validate it
+        
+        Candidates are decoded and validated in a single pass by
+        pydantic-core; malformed JSON moves on to the next candidate.
+        
+        Args:
+            response_text: Raw response text
+            
+        Returns:
+            Tuple of (validated model, parsing method) or (None, None)
+            
+        Raises:
+            ValidationError: If well-formed JSON does not match the schema
+        """
+        for i, match in self._iter_candidates(response_text):
+            try:
+                feedback_model = _validate_feedback_json(match)
+            except ValidationError as e:
+                if _is_json_syntax_error(e):
+                    continue
+                raise
+            
+            parsing_method = f"pattern_{i}"
+            logger.info(
+                "json_extraction_success",
+                method=parsing_method,
+                pattern_index=i
+            )
+            return feedback_model, parsing_method
+        
+        return None, None
+    
+    def _iter_candidates(self, response_text: str) -> Iterator[Tuple[int, str]]:
+        """
+        Yield (strategy index, candidate JSON text) in priority order
+        
+        Later strategies only run if earlier candidates were all rejected.
+        """
+        json_blocks = []
+        generic_blocks = []
+        for match in self._code_block_pattern.finditer(response_text):
+            (json_blocks if match.group(1) else generic_blocks).append(match.group(2))
+        
+        for candidate in json_blocks:
+            yield 0, candidate
+        for candidate in generic_blocks:
+            yield 1, candidate
+        for candidate in _find_json_spans(response_text):
+            yield 2, candidate
+        for candidate in self._simple_object_pattern.findall(response_text):
+            yield 3, candidate
     
     def _fallback_parsing(self, response_text: str) -> Optional[Dict[str, Any]]:
         """
@@ -745,66 +1196,18 @@ class ResponseParser:
         
         return None
     
-    def _validate_and_structure(self, data: Dict[str, Any], raw_response: str) -> AIFeedback:
+    def _to_feedback(self, model: AIFeedbackModel, raw_response: str) -> AIFeedback:
         """
-        Validate extracted JSON and create structured feedback
+        Convert a validated feedback model into structured feedback
         
         Args:
-            data: Extracted JSON data
+            model: Validated feedback model
             raw_response: Original response text
             
         Returns:
-            Validated AIFeedback object
-        """
-        # Validate required fields
-        for field, expected_type in self.required_fields.items():
-            if field not in data:
-                raise ValueError(f"Missing required field: {field}")
-            
-            if not isinstance(data[field], expected_type):
-                # Try to convert if possible
-                if expected_type == list and isinstance(data[field], str):
-                    data[field] = [data[field]]
-                elif expected_type == str and isinstance(data[field], list):
-                    data[field] = '. '.join(str(item) for item in data[field])
-                else:
-                    raise ValueError(f"Invalid type for {field}: expected {expected_type}")
-        
-        # Add optional fields with defaults
-        for field, default_value in self.optional_fields.items():
-            if field not in data:
-                data[field] = default_value
-        
-        # Validate priority_improvements structure
-        if 'priority_improvements' in data:
-            validated_improvements = []
-            for imp in data['priority_improvements']:
-                if isinstance(imp, dict):
-                    validated_improvements.append({
-                        'category': imp.get('category', 'General'),
-                        'priority': imp.get('priority', 'Medium'),
-                        'recommendation': imp.get('recommendation', str(imp)),
-                        'impact': imp.get('impact', 'Will improve resume quality')
-                    })
-                elif isinstance(imp, str):
-                    validated_improvements.append({
-                        'category': 'General',
-                        'priority': 'Medium',
-                        'recommendation': imp,
-                        'impact': 'Will improve resume quality'
-                    })
-            data['priority_improvements'] = validated_improvements
-        
-        # Create AIFeedback object
-        return AIFeedback(
-            overall_assessment=data['overall_assessment'],
-            match_score_interpretation=data.get('match_score_interpretation', ''),
-            strengths=data['strengths'],
-            priority_improvements=data['priority_improvements'],
-            missing_keywords_analysis=data.get('missing_keywords_analysis', {}),
-            ats_optimization_tips=data.get('ats_optimization_tips', []),
-            raw_response=raw_response
-        )
+            AIFeedback object
+        """
+        return AIFeedback(**model.model_dump(), raw_response=raw_response)
     
     def _create_minimal_feedback(self, response_text: str) -> AIFeedback:
         """
@@ -829,51 +1232,268 @@ class ResponseParser:
             missing_keywords_analysis={'critical_missing': [], 'suggestions': 'See raw response'},
             ats_optimization_tips=['Review raw AI response for specific recommendations'],
             raw_response=response_text,
-            parsing_confidence=0.1
+            parsing_confidence=MINIMAL_FEEDBACK_CONFIDENCE
         )
     
-    def _calculate_confidence(self, data: Dict[str, Any], parsing_method: str) -> float:
+    def _calculate_confidence(self, data: Collection[str], parsing_method: str) -> float:
         """
         Calculate confidence score for parsed response
         
         Args:
-            data: Parsed data
+            data: Field names present in the parsed data
             parsing_method: Method used for parsing
             
         Returns:
             Confidence score between 0 and 1
         """
-        confidence = 0.5  # Base confidence
+        # Base confidence adjusted by parsing method, plus weighted data completeness
+        confidence = (
+            0.5
+            + self._method_bonus.get(parsing_method, 0.0)
+            + len(self._required_names.intersection(data)) * self._required_weight
+            + len(self._optional_names.intersection(data)) * self._optional_weight
+        )
         
-        # Boost confidence based on parsing method
-        if parsing_method.startswith('pattern_0'):  # JSON in code blocks
-            confidence += 0.4
-        elif parsing_method.startswith('pattern_1'):  # Generic code blocks
-            confidence += 0.3
-        elif parsing_method.startswith('pattern_2'):  # Balanced braces
-            confidence += 0.2
-        elif parsing_method == 'fallback':
-            confidence = 0.3
+        return 1.0 if confidence > 1.0 else confidence
+
+
+class PromptBatcher:
+    """
+    Coalesces prompts submitted within a short window into one Gemini call
+    
+    The combined prompt asks the model to answer each request under its own
+    marker line; the response is split on those markers. A request whose
+    answer is missing fails with AIServiceError so the caller can fall back.
+    """
+    
+    _MARKER_PATTERN = re.compile(r'^###REQ (\d+)###[ \t]*$', re.MULTILINE)
+    
+    def __init__(
+        self,
+        get_client: Callable[[], Awaitable[GeminiClient]],
+        max_size: int = 8,
+        window_seconds: float = 0.02
+    ):
+        self.get_client = get_client
+        self.max_size = max_size
+        self.window_seconds = window_seconds
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._dispatches: set = set()  # strong references to running dispatch tasks
+    
+    async def submit(self, prompt: str) -> Tuple[str, Optional[str]]:
+        """
+        Queue a prompt for the next batch and wait for its answer
         
-        # Boost confidence based on data completeness
-        required_fields_present = sum(1 for field in self.required_fields if field in data)
-        optional_fields_present = sum(1 for field in self.optional_fields if field in data)
+        Returns:
+            Tuple of (response text, text of the first JSON object or None)
+        """
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._worker.get_loop() is not loop:
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
         
-        completeness_score = (required_fields_present / len(self.required_fields)) * 0.3
-        completeness_score += (optional_fields_present / len(self.optional_fields)) * 0.2
+        future = loop.create_future()
+        await self._queue.put((prompt, future))
+        return await future
+    
+    async def _run(self):
+        """Collect batches from the queue and dispatch them"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.window_seconds
+            while len(batch) < self.max_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            
+            # Dispatch concurrently so the next window can start collecting
+            task = loop.create_task(self._dispatch(batch))
+            self._dispatches.add(task)
+            task.add_done_callback(self._dispatches.discard)
+    
+    async def _dispatch(self, batch: List[Tuple[str, asyncio.Future]]):
+        """Send one batch to Gemini and resolve each caller's future"""
+        batch = [(prompt, future) for prompt, future in batch if not future.done()]
+        if not batch:
+            return
         
-        confidence += completeness_score
+        try:
+            client = await self.get_client()
+            
+            if len(batch) == 1:
+                prompt, future = batch[0]
+                result = await client.generate_response_with_json(prompt)
+                if not future.done():
+                    future.set_result(result)
+                return
+            
+            logger.info("gemini_batch_dispatched", batch_size=len(batch))
+            response = await client.generate_response(self._combine([prompt for prompt, _ in batch]))
+            answers = self._split(response)
+            
+            for index, (_, future) in enumerate(batch, start=1):
+                if future.done():
+                    continue
+                answer = answers.get(index)
+                if answer:
+                    scanner = JsonSpanScanner()
+                    scanner.feed(answer)
+                    future.set_result((answer, scanner.span))
+                else:
+                    future.set_exception(AIServiceError(
+                        message="Batched response did not include an answer for this request",
+                        service_name="gemini",
+                        details={"batch_size": len(batch), "batch_index": index}
+                    ))
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+    
+    @staticmethod
+    def _combine(prompts: List[str]) -> str:
+        """Build a single prompt answering every request under its marker"""
+        sections = [
+            f"You will receive {len(prompts)} independent requests. Answer each one "
+            "separately and completely. Begin each answer with its marker line exactly "
+            "as given (for example ###REQ 1###) on a line of its own, and do not add "
+            "any text outside the marked answers."
+        ]
+        for index, prompt in enumerate(prompts, start=1):
+            sections.append(f"###REQ {index}###\n{prompt}")
+        return "\n\n".join(sections)
+    
+    @classmethod
+    def _split(cls, response: str) -> Dict[int, str]:
+        """Split a batched response into answers keyed by request number"""
+        answers: Dict[int, str] = {}
+        markers = list(cls._MARKER_PATTERN.finditer(response))
+        for i, marker in enumerate(markers):
+            end = markers[i + 1].start() if i + 1 < len(markers) else len(response)
+            answers[int(marker.group(1))] = response[marker.end():end].strip()
+        return answers
+
+
+class FeedbackCache:
+    """
+    Two-tier in-process cache of generated feedback
+    
+    Exact hits are keyed on the prompt digest and evicted in LRU order. The
+    optional semantic tier matches on resume and job description embeddings,
+    requiring both to be at least `threshold` cosine-similar to a cached pair.
+    Feedback is copied in and out, so callers may mutate what they receive.
+    """
+    
+    def __init__(self, maxsize: int = 256, threshold: float = 0.95):
+        self.maxsize = maxsize
+        self.threshold = threshold
+        self._entries: "OrderedDict[bytes, AIFeedback]" = OrderedDict()
+        # Normalized (2, dim) context embeddings for entries in the semantic tier
+        self._vectors: Dict[bytes, np.ndarray] = {}
+        self._matrix: Optional[np.ndarray] = None
+        self._matrix_keys: List[bytes] = []
+    
+    def get(self, key: bytes) -> Optional[AIFeedback]:
+        """Return the cached feedback for an exact prompt digest"""
+        feedback = self._entries.get(key)
+        if feedback is None:
+            return None
+        self._entries.move_to_end(key)
+        return copy.deepcopy(feedback)
+    
+    def find_similar(self, vectors: np.ndarray) -> Optional[AIFeedback]:
+        """Return cached feedback whose context embeddings are near-identical"""
+        if not self._vectors:
+            return None
+        
+        if self._matrix is None:
+            self._matrix_keys = list(self._vectors)
+            self._matrix = np.stack([self._vectors[k] for k in self._matrix_keys])
         
-        return min(confidence, 1.0)
+        # Cosine similarity of resume and job description; both must match
+        scores = np.einsum('nkd,kd->nk', self._matrix, vectors).min(axis=1)
+        best = int(np.argmax(scores))
+        if scores[best] < self.threshold:
+            return None
+        return self.get(self._matrix_keys[best])
+    
+    def put(self, key: bytes, feedback: AIFeedback, vectors: Optional[np.ndarray] = None):
+        """Store feedback, evicting the least recently used entries"""
+        self._entries[key] = copy.deepcopy(feedback)
+        self._entries.move_to_end(key)
+        if vectors is not None:
+            self._vectors[key] = vectors
+            self._matrix = None
+        
+        while len(self._entries) > self.maxsize:
+            evicted, _ = self._entries.popitem(last=False)
+            if self._vectors.pop(evicted, None) is not None:
+                self._matrix = None
+    
+    def clear(self):
+        """Drop all cached feedback"""
+        self._entries.clear()
+        self._vectors.clear()
+        self._matrix = None
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Immutable context shared by every health check
+HEALTH_CHECK_CONTEXT = AnalysisContext(
+    resume_entities={'skills': ['Python', 'JavaScript']},
+    match_score=75.0,
+    matched_keywords=('Python', 'API'),
+    missing_keywords=('Docker', 'AWS'),
+    semantic_similarity=0.75,
+    keyword_coverage=0.60,
+    job_description="Test job description for health check",
+    resume_text="Test resume text"
+)
 
 
 class AIService:
     """Complete AI feedback generation service"""
     
     def __init__(self):
-        self.gemini_client = gemini_client
+        self.gemini_client: Optional[GeminiClient] = None
         self.prompt_engine = PromptEngine()
         self.response_parser = ResponseParser()
+        self.feedback_cache = FeedbackCache(
+            maxsize=settings.AI_FEEDBACK_CACHE_SIZE,
+            threshold=settings.AI_SEMANTIC_CACHE_THRESHOLD
+        )
+        self.batcher: Optional[PromptBatcher] = None
+        if settings.AI_BATCHING_ENABLED:
+            self.batcher = PromptBatcher(
+                self._get_gemini_client,
+                max_size=settings.AI_BATCH_MAX_SIZE,
+                window_seconds=settings.AI_BATCH_WINDOW_MS / 1000
+            )
+        
+        # Health checks reuse one test prompt; retried lazily if this fails
+        self._test_prompt: Optional[str] = None
+        try:
+            self._test_prompt = self._build_test_prompt()
+        except Exception as e:
+            logger.warning("health_check_prompt_build_failed", error=str(e))
+    
+    def _build_test_prompt(self) -> str:
+        """Build the analysis prompt used by health checks"""
+        return self.prompt_engine.build_analysis_prompt(HEALTH_CHECK_CONTEXT)
+    
+    async def _get_gemini_client(self) -> GeminiClient:
+        """Resolve the shared Gemini client on first use"""
+        if self.gemini_client is None:
+            self.gemini_client = await get_gemini_client()
+        return self.gemini_client
     
     async def generate_feedback(self, context: AnalysisContext) -> AIFeedback:
         """
@@ -895,26 +1515,49 @@ class AIService:
                 matched_keywords_count=len(context.matched_keywords),
                 missing_keywords_count=len(context.missing_keywords)
             )
-            print(f"DEBUG: Starting AI feedback generation with match_score: {context.match_score}")
+            
+            gemini_client = await self._get_gemini_client()
             
             # Build the analysis prompt
             prompt = self.prompt_engine.build_analysis_prompt(context)
             
+            # Serve identical (or, if enabled, near-identical) requests from cache.
+            # The key covers exactly what the prompt sends: extracted entities,
+            # keywords, scores and the first 500 characters of the job
+            # description, not the raw resume text
+            cache_key = hashlib.sha256(prompt.encode('utf-8')).digest()
+            context_vectors = None
+            cached = self.feedback_cache.get(cache_key)
+            if cached is None and settings.AI_SEMANTIC_CACHE_ENABLED:
+                context_vectors = await self._embed_context(context)
+                if context_vectors is not None:
+                    cached = self.feedback_cache.find_similar(context_vectors)
+            if cached is not None:
+                logger.info("ai_feedback_cache_hit", cache_size=len(self.feedback_cache))
+                return cached
+            
             # Generate response from Gemini
-            print("DEBUG: About to call Gemini API...")
+            used_fallback = False
             try:
-                raw_response = await self.gemini_client.generate_response(prompt)
-                print(f"DEBUG: Gemini API response received, length: {len(raw_response)}")
+                if self.batcher is not None:
+                    raw_response, json_span = await self.batcher.submit(prompt)
+                else:
+                    raw_response, json_span = await gemini_client.generate_response_with_json(prompt)
+                logger.debug("gemini_response_received", response_length=len(raw_response))
             except (AIServiceError, APIRateLimitError) as e:
                 # Try fallback prompt if main prompt fails
-                print(f"DEBUG: Main prompt failed: {str(e)}, trying fallback...")
                 logger.warning("main_prompt_failed_trying_fallback", error=str(e))
                 fallback_prompt = self.prompt_engine.build_fallback_prompt(context)
-                raw_response = await self.gemini_client.generate_response(fallback_prompt)
-                print(f"DEBUG: Fallback response received, length: {len(raw_response)}")
+                raw_response, json_span = await gemini_client.generate_response_with_json(fallback_prompt)
+                used_fallback = True
+                logger.debug("gemini_fallback_response_received", response_length=len(raw_response))
             
             # Parse and validate the response
-            feedback = self.response_parser.parse_response(raw_response)
+            feedback = self.response_parser.parse_response(raw_response, json_span)
+            
+            # Only cache complete answers to the main prompt
+            if not used_fallback and feedback.parsing_confidence > MINIMAL_FEEDBACK_CONFIDENCE:
+                self.feedback_cache.put(cache_key, feedback, context_vectors)
             
             logger.info(
                 "ai_feedback_generated",
@@ -940,6 +1583,26 @@ class AIService:
                 }
             )
     
+    async def _embed_context(self, context: AnalysisContext) -> Optional[np.ndarray]:
+        """
+        Embed resume and job description for the semantic cache tier
+        
+        Returns:
+            Stacked (2, dim) normalized embeddings, or None if unavailable
+        """
+        from app.services.semantic_service import get_semantic_service
+        
+        try:
+            semantic_service = get_semantic_service()
+            resume_vector, job_vector = await asyncio.gather(
+                semantic_service.generate_embedding_only(context.resume_text),
+                semantic_service.generate_embedding_only(context.job_description)
+            )
+            return np.stack([resume_vector, job_vector])
+        except Exception as e:
+            logger.warning("semantic_cache_embedding_failed", error=str(e))
+            return None
+    
     async def health_check(self) -> Dict[str, Any]:
         """
         Perform comprehensive health check of AI service
@@ -949,21 +1612,13 @@ class AIService:
         """
         try:
             # Check Gemini client health
-            gemini_health = await self.gemini_client.health_check()
-            
-            # Test prompt generation
-            test_context = AnalysisContext(
-                resume_entities={'skills': ['Python', 'JavaScript']},
-                match_score=75.0,
-                matched_keywords=['Python', 'API'],
-                missing_keywords=['Docker', 'AWS'],
-                semantic_similarity=0.75,
-                keyword_coverage=0.60,
-                job_description="Test job description for health check",
-                resume_text="Test resume text"
-            )
+            gemini_client = await self._get_gemini_client()
+            gemini_health = await gemini_client.health_check()
             
-            test_prompt = self.prompt_engine.build_analysis_prompt(test_context)
+            # Test prompt generation (built once and reused across probes)
+            if self._test_prompt is None:
+                self._test_prompt = self._build_test_prompt()
+            test_prompt = self._test_prompt
             prompt_generated = len(test_prompt) > 100
             
             # Overall health status
@@ -983,7 +1638,7 @@ class AIService:
                     },
                     'response_parser': {
                         'status': 'healthy',
-                        'patterns_loaded': len(self.response_parser.json_patterns)
+                        'patterns_loaded': len(self.response_parser.json_strategies)
                     }
                 }
             }
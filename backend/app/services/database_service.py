@@ -6,11 +6,13 @@ The Supabase client communicates over HTTPS (port 443) — works on all plans.
 Public interface is identical to the previous implementation.
 """
 import asyncio
-from typing import List, Optional, Dict, Any
+import json
+import time
+from typing import List, Optional, Dict, Any, Tuple
 from uuid import UUID
 from datetime import datetime
 
-from supabase import create_client, Client
+from supabase import create_client, Client, ClientOptions
 
 from app.config import settings
 from app.models.entities import UserProfile, Resume, Analysis, AnalysisResult
@@ -20,15 +22,79 @@ from app.core.exceptions import DatabaseError
 
 logger = get_logger(__name__)
 
+_PROFILES_TABLE = "profiles"
+_RESUMES_TABLE = "resumes"
+_ANALYSES_TABLE = "analyses"
+
+
+_supabase: Optional[Client] = None
+
 
 def _get_supabase() -> Client:
-    """Return a Supabase client using the service-role key (bypasses RLS for server-side ops)."""
-    return create_client(settings.SUPABASE_URL, settings.SUPABASE_SERVICE_ROLE_KEY)
+    """Return the shared Supabase client using the service-role key (bypasses RLS for server-side ops).
+
+    The client is created once and reused so its HTTP session keeps resolved,
+    already-handshaken connections to the project host between calls.
+    """
+    global _supabase
+    client = _supabase
+    if client is None:
+        client = _supabase = create_client(
+            settings.SUPABASE_URL,
+            settings.SUPABASE_SERVICE_ROLE_KEY,
+            options=ClientOptions(postgrest_client_timeout=settings.DB_COMMAND_TIMEOUT),
+        )
+    return client
+
+
+def _reset_supabase() -> None:
+    """Drop the shared client so the next call re-resolves the host and reconnects.
+
+    The old client is not closed here: worker threads may still be using its
+    HTTP session for in-flight calls. It is released once they finish and
+    it is garbage collected.
+    """
+    global _supabase
+    _supabase = None
+
+
+# Caps in-flight Supabase calls (and so worker threads / open connections).
+# Created lazily per running loop: a semaphore binds to the first loop that
+# waits on it, and tests / TestClient run each app on a fresh loop.
+_db_slots: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = None
+
+
+def _get_db_slots() -> asyncio.Semaphore:
+    """Return the call-limiting semaphore for the running event loop."""
+    global _db_slots
+    loop = asyncio.get_running_loop()
+    slots = _db_slots
+    if slots is None or slots[0] is not loop:
+        slots = _db_slots = (loop, asyncio.Semaphore(settings.DB_POOL_MAX))
+    return slots[1]
 
 
 async def _run(fn):
     """Run a synchronous supabase-py call in a thread so we don't block the event loop."""
-    return await asyncio.to_thread(fn)
+    async with _get_db_slots():
+        return await asyncio.to_thread(fn)
+
+
+_ts_cache = (0, "")
+
+
+def _utc_timestamp() -> str:
+    """ISO timestamp for health payloads, formatted at most once per second."""
+    global _ts_cache
+    now = int(time.time())
+    if now != _ts_cache[0]:
+        _ts_cache = (now, datetime.utcfromtimestamp(now).isoformat())
+    return _ts_cache[1]
+
+
+def _probe(client: Client):
+    """Lightweight table probe — succeeds as long as the project is reachable."""
+    return client.table(_RESUMES_TABLE).select("id").limit(1).execute()
 
 
 # ---------------------------------------------------------------------------
@@ -42,12 +108,15 @@ class DatabaseConnectionManager:
         """Verify connectivity by pinging the Supabase REST endpoint."""
         try:
             client = _get_supabase()
-            # A lightweight table probe — succeeds as long as the project is reachable
-            await _run(lambda: client.table("resumes").select("id").limit(1).execute())
+            if settings.DB_WARMUP:
+                # One probe is enough: the shared client's HTTP session opens
+                # connections lazily, so extra probes would not pre-open any
+                await asyncio.wait_for(_run(lambda: _probe(client)), settings.DB_CONNECT_TIMEOUT)
             logger.info("Supabase REST client initialised successfully",
                         url=settings.SUPABASE_URL)
         except Exception as e:
             # Non-fatal: log and continue; individual operations will surface errors
+            _reset_supabase()
             logger.warning("Supabase connectivity check failed — will retry on first use",
                            error=str(e))
 
@@ -58,17 +127,61 @@ class DatabaseConnectionManager:
     async def health_check(self) -> Dict[str, Any]:
         try:
             client = _get_supabase()
-            await _run(lambda: client.table("resumes").select("id").limit(1).execute())
-            return {"status": "healthy", "backend": "supabase-rest", "timestamp": datetime.utcnow().isoformat()}
+            await _run(lambda: _probe(client))
+            return {"status": "healthy", "backend": "supabase-rest", "timestamp": _utc_timestamp()}
         except Exception as e:
+            _reset_supabase()
             logger.error("Database health check failed", error=str(e))
-            return {"status": "unhealthy", "error": str(e), "timestamp": datetime.utcnow().isoformat()}
+            return {"status": "unhealthy", "error": str(e), "timestamp": _utc_timestamp()}
 
 
 # ---------------------------------------------------------------------------
 # Repositories
 # ---------------------------------------------------------------------------
 
+# Column lists for the read queries, shared so every call sends the same select
+_PROFILE_COLUMNS = "id, email, full_name, avatar_url, created_at"
+_RESUME_COLUMNS = "id, user_id, file_name, file_url, parsed_text, uploaded_at"
+_ANALYSIS_COLUMNS = ("id, user_id, resume_id, job_title, job_description, "
+                     "match_score, ai_feedback, matched_keywords, missing_keywords, created_at")
+
+
+def _row_to_resume(d: Dict[str, Any]) -> Resume:
+    """Build a Resume from a row selected with _RESUME_COLUMNS."""
+    get = d.get
+    return Resume(d["id"], d["user_id"], d["file_name"], get("file_url"),
+                  get("parsed_text"), get("uploaded_at"))
+
+
+def _decode_json(value: Any) -> Any:
+    """Decode a JSON column that was stored as serialized text.
+
+    Text that is not valid JSON (legacy rows) is returned as-is rather than
+    failing the whole result set.
+    """
+    if not isinstance(value, str):
+        return value
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+
+def _row_to_analysis(d: Dict[str, Any]) -> Analysis:
+    """Build an Analysis from a row selected with _ANALYSIS_COLUMNS.
+
+    The JSON columns are decoded here, once per row, so callers always get
+    dicts and lists regardless of how the row was written.
+    """
+    get = d.get
+    return Analysis(d["id"], d["user_id"], get("resume_id"), get("job_title"),
+                    get("job_description"), get("match_score"),
+                    _decode_json(get("ai_feedback")),
+                    _decode_json(get("matched_keywords")),
+                    _decode_json(get("missing_keywords")),
+                    get("created_at"))
+
+
 class UserRepository:
     """Repository for user-profile operations."""
 
@@ -77,12 +190,13 @@ class UserRepository:
 
     @async_timer
     async def get_user_by_id(self, user_id: UUID) -> Optional[UserProfile]:
+        key = str(user_id)
         try:
             client = _get_supabase()
             res = await _run(
-                lambda: client.table("profiles")
-                    .select("id, email, full_name, avatar_url, created_at")
-                    .eq("id", str(user_id))
+                lambda: client.table(_PROFILES_TABLE)
+                    .select(_PROFILE_COLUMNS)
+                    .eq("id", key)
                     .single()
                     .execute()
             )
@@ -97,25 +211,26 @@ class UserRepository:
                 )
             return None
         except Exception as e:
-            logger.error("Failed to get user by ID", user_id=str(user_id), error=str(e))
+            logger.error("Failed to get user by ID", user_id=key, error=str(e))
             raise DatabaseError(f"Failed to get user: {e}")
 
     @async_timer
     async def create_user_profile(self, user_profile: UserProfile) -> UserProfile:
+        user_id = str(user_profile.id)
         try:
             client = _get_supabase()
             await _run(
-                lambda: client.table("profiles").upsert({
-                    "id": str(user_profile.id),
+                lambda: client.table(_PROFILES_TABLE).upsert({
+                    "id": user_id,
                     "email": user_profile.email,
                     "full_name": user_profile.full_name,
                     "avatar_url": user_profile.avatar_url,
                 }).execute()
             )
-            logger.info("User profile upserted", user_id=str(user_profile.id))
+            logger.info("User profile upserted", user_id=user_id)
             return user_profile
         except Exception as e:
-            logger.error("Failed to create user profile", user_id=str(user_profile.id), error=str(e))
+            logger.error("Failed to create user profile", user_id=user_id, error=str(e))
             raise DatabaseError(f"Failed to create user profile: {e}")
 
 
@@ -127,11 +242,12 @@ class ResumeRepository:
 
     @async_timer
     async def create_resume(self, resume: Resume) -> Resume:
+        user_id = str(resume.user_id)
         try:
             client = _get_supabase()
             res = await _run(
-                lambda: client.table("resumes").insert({
-                    "user_id": str(resume.user_id),
+                lambda: client.table(_RESUMES_TABLE).insert({
+                    "user_id": user_id,
                     "file_name": resume.file_name,
                     "file_url": resume.file_url,
                     "parsed_text": resume.parsed_text,
@@ -141,71 +257,76 @@ class ResumeRepository:
                 row = res.data[0]
                 resume.id = row.get("id", resume.id)
                 resume.uploaded_at = row.get("uploaded_at", resume.uploaded_at)
-            logger.info("Resume created", resume_id=str(resume.id), user_id=str(resume.user_id))
+            logger.info("Resume created", resume_id=str(resume.id), user_id=user_id)
             return resume
         except Exception as e:
-            logger.error("Failed to create resume", user_id=str(resume.user_id), error=str(e))
+            logger.error("Failed to create resume", user_id=user_id, error=str(e))
             raise DatabaseError(f"Failed to create resume: {e}")
 
     async def get_resume_by_id(self, resume_id: UUID) -> Optional[Resume]:
+        key = str(resume_id)
         try:
             client = _get_supabase()
             res = await _run(
-                lambda: client.table("resumes")
-                    .select("id, user_id, file_name, file_url, parsed_text, uploaded_at")
-                    .eq("id", str(resume_id))
+                lambda: client.table(_RESUMES_TABLE)
+                    .select(_RESUME_COLUMNS)
+                    .eq("id", key)
                     .single()
                     .execute()
             )
             if res.data:
-                d = res.data
-                return Resume(
-                    id=d["id"], user_id=d["user_id"], file_name=d["file_name"],
-                    file_url=d.get("file_url"), parsed_text=d.get("parsed_text"),
-                    uploaded_at=d.get("uploaded_at"),
-                )
+                return _row_to_resume(res.data)
             return None
         except Exception as e:
-            logger.error("Failed to get resume by ID", resume_id=str(resume_id), error=str(e))
+            logger.error("Failed to get resume by ID", resume_id=key, error=str(e))
             raise DatabaseError(f"Failed to get resume: {e}")
 
     async def get_user_resumes(self, user_id: UUID) -> List[Resume]:
+        key = str(user_id)
         try:
             client = _get_supabase()
             res = await _run(
-                lambda: client.table("resumes")
-                    .select("id, user_id, file_name, file_url, parsed_text, uploaded_at")
-                    .eq("user_id", str(user_id))
+                lambda: client.table(_RESUMES_TABLE)
+                    .select(_RESUME_COLUMNS)
+                    .eq("user_id", key)
                     .order("uploaded_at", desc=True)
                     .execute()
             )
-            return [
-                Resume(
-                    id=d["id"], user_id=d["user_id"], file_name=d["file_name"],
-                    file_url=d.get("file_url"), parsed_text=d.get("parsed_text"),
-                    uploaded_at=d.get("uploaded_at"),
-                )
-                for d in (res.data or [])
-            ]
+            return [_row_to_resume(d) for d in (res.data or [])]
         except Exception as e:
-            logger.error("Failed to get user resumes", user_id=str(user_id), error=str(e))
+            logger.error("Failed to get user resumes", user_id=key, error=str(e))
             raise DatabaseError(f"Failed to get user resumes: {e}")
 
     async def update_resume_text(self, resume_id: UUID, parsed_text: str) -> None:
+        key = str(resume_id)
         try:
             client = _get_supabase()
             await _run(
-                lambda: client.table("resumes")
+                lambda: client.table(_RESUMES_TABLE)
                     .update({"parsed_text": parsed_text})
-                    .eq("id", str(resume_id))
+                    .eq("id", key)
                     .execute()
             )
-            logger.info("Resume text updated", resume_id=str(resume_id))
+            logger.info("Resume text updated", resume_id=key)
         except Exception as e:
-            logger.error("Failed to update resume text", resume_id=str(resume_id), error=str(e))
+            logger.error("Failed to update resume text", resume_id=key, error=str(e))
             raise DatabaseError(f"Failed to update resume text: {e}")
 
 
+def _analysis_row(analysis_result: AnalysisResult) -> Dict[str, Any]:
+    """Map an AnalysisResult onto the analyses table's insert payload."""
+    return {
+        "user_id": str(analysis_result.user_id),
+        "resume_id": str(analysis_result.resume_id),
+        "job_title": analysis_result.job_title,
+        "job_description": analysis_result.job_description,
+        "match_score": round(analysis_result.match_score),
+        "ai_feedback": analysis_result.ai_feedback,
+        "matched_keywords": analysis_result.matched_keywords,
+        "missing_keywords": analysis_result.missing_keywords,
+    }
+
+
 class AnalysisRepository:
     """Repository for analysis operations."""
 
@@ -215,95 +336,134 @@ class AnalysisRepository:
     @async_timer
     async def create_analysis(self, analysis_result: AnalysisResult) -> str:
         try:
+            row = _analysis_row(analysis_result)
             client = _get_supabase()
-            res = await _run(
-                lambda: client.table("analyses").insert({
-                    "user_id": str(analysis_result.user_id),
-                    "resume_id": str(analysis_result.resume_id),
-                    "job_title": analysis_result.job_title,
-                    "job_description": analysis_result.job_description,
-                    "match_score": round(analysis_result.match_score),
-                    "ai_feedback": analysis_result.ai_feedback,
-                    "matched_keywords": analysis_result.matched_keywords,
-                    "missing_keywords": analysis_result.missing_keywords,
-                }).execute()
-            )
+            res = await _run(lambda: client.table(_ANALYSES_TABLE).insert(row).execute())
             if not res.data:
                 raise DatabaseError("Analysis insert returned no data")
             analysis_id = str(res.data[0]["id"])
             logger.info("Analysis created", analysis_id=analysis_id,
-                        user_id=str(analysis_result.user_id),
+                        user_id=row["user_id"],
                         match_score=analysis_result.match_score)
             return analysis_id
         except Exception as e:
             logger.error("Failed to create analysis", user_id=str(analysis_result.user_id), error=str(e))
             raise DatabaseError(f"Failed to create analysis: {e}")
 
+    @async_timer
+    async def create_analyses_bulk(self, analysis_results: List[AnalysisResult]) -> List[str]:
+        """Insert many analyses in a single request and return their IDs in order."""
+        if not analysis_results:
+            return []
+        try:
+            client = _get_supabase()
+            rows = [_analysis_row(r) for r in analysis_results]
+            res = await _run(lambda: client.table(_ANALYSES_TABLE).insert(rows).execute())
+            if not res.data or len(res.data) != len(rows):
+                raise DatabaseError("Bulk analysis insert returned incomplete data")
+            analysis_ids = [str(d["id"]) for d in res.data]
+            logger.info("Analyses created", count=len(analysis_ids))
+            return analysis_ids
+        except Exception as e:
+            logger.error("Failed to create analyses in bulk", count=len(analysis_results), error=str(e))
+            raise DatabaseError(f"Failed to create analyses: {e}")
+
     async def get_analysis_by_id(self, analysis_id: UUID) -> Optional[Analysis]:
+        key = str(analysis_id)
         try:
             client = _get_supabase()
             res = await _run(
-                lambda: client.table("analyses")
-                    .select("id, user_id, resume_id, job_title, job_description, "
-                            "match_score, ai_feedback, matched_keywords, missing_keywords, created_at")
-                    .eq("id", str(analysis_id))
+                lambda: client.table(_ANALYSES_TABLE)
+                    .select(_ANALYSIS_COLUMNS)
+                    .eq("id", key)
                     .single()
                     .execute()
             )
             if res.data:
-                d = res.data
-                return Analysis(
-                    id=d["id"], user_id=d["user_id"], resume_id=d.get("resume_id"),
-                    job_title=d.get("job_title"), job_description=d.get("job_description"),
-                    match_score=d.get("match_score"), ai_feedback=d.get("ai_feedback"),
-                    matched_keywords=d.get("matched_keywords"),
-                    missing_keywords=d.get("missing_keywords"),
-                    created_at=d.get("created_at"),
-                )
+                return _row_to_analysis(res.data)
             return None
         except Exception as e:
-            logger.error("Failed to get analysis by ID", analysis_id=str(analysis_id), error=str(e))
+            logger.error("Failed to get analysis by ID", analysis_id=key, error=str(e))
             raise DatabaseError(f"Failed to get analysis: {e}")
 
-    async def get_user_analyses(self, user_id: UUID, limit: int = 50, offset: int = 0) -> List[Analysis]:
+    async def get_user_analyses(
+        self,
+        user_id: UUID,
+        limit: int = 50,
+        offset: int = 0,
+        cursor_created_at: Optional[Any] = None,
+        cursor_id: Optional[UUID] = None,
+    ) -> List[Analysis]:
+        """Return a page of the user's analyses, newest first.
+
+        Passing the (created_at, id) of the last row of the previous page as the
+        cursor pages by key instead of offset, so the server seeks straight to
+        the next row rather than scanning and discarding the skipped ones.
+        """
+        key = str(user_id)
+        try:
+            client = _get_supabase()
+
+            def query():
+                q = (client.table(_ANALYSES_TABLE)
+                     .select(_ANALYSIS_COLUMNS)
+                     .eq("user_id", key)
+                     .order("created_at", desc=True)
+                     .order("id", desc=True))
+                if cursor_created_at is None or cursor_id is None:
+                    return q.range(offset, offset + limit - 1).execute()
+                ts = (cursor_created_at.isoformat() if isinstance(cursor_created_at, datetime)
+                      else cursor_created_at)
+                return (q.or_(f'created_at.lt."{ts}",'
+                              f'and(created_at.eq."{ts}",id.lt.{cursor_id})')
+                        .limit(limit)
+                        .execute())
+
+            res = await _run(query)
+            return [_row_to_analysis(d) for d in (res.data or [])]
+        except Exception as e:
+            logger.error("Failed to get user analyses", user_id=key, error=str(e))
+            raise DatabaseError(f"Failed to get user analyses: {e}")
+
+    async def get_user_analyses_page(
+        self, user_id: UUID, limit: int = 50, offset: int = 0
+    ) -> Tuple[List[Analysis], int]:
+        """Return a page of the user's analyses together with their total count.
+
+        The exact count is requested on the same query, so list views need a
+        single round-trip instead of a page fetch plus a separate count.
+        """
+        key = str(user_id)
         try:
             client = _get_supabase()
             res = await _run(
-                lambda: client.table("analyses")
-                    .select("id, user_id, resume_id, job_title, job_description, "
-                            "match_score, ai_feedback, matched_keywords, missing_keywords, created_at")
-                    .eq("user_id", str(user_id))
+                lambda: client.table(_ANALYSES_TABLE)
+                    .select(_ANALYSIS_COLUMNS, count="exact")
+                    .eq("user_id", key)
                     .order("created_at", desc=True)
+                    .order("id", desc=True)
                     .range(offset, offset + limit - 1)
                     .execute()
             )
-            return [
-                Analysis(
-                    id=d["id"], user_id=d["user_id"], resume_id=d.get("resume_id"),
-                    job_title=d.get("job_title"), job_description=d.get("job_description"),
-                    match_score=d.get("match_score"), ai_feedback=d.get("ai_feedback"),
-                    matched_keywords=d.get("matched_keywords"),
-                    missing_keywords=d.get("missing_keywords"),
-                    created_at=d.get("created_at"),
-                )
-                for d in (res.data or [])
-            ]
+            return [_row_to_analysis(d) for d in (res.data or [])], res.count or 0
         except Exception as e:
-            logger.error("Failed to get user analyses", user_id=str(user_id), error=str(e))
+            logger.error("Failed to get user analyses page", user_id=key, error=str(e))
             raise DatabaseError(f"Failed to get user analyses: {e}")
 
     async def get_user_analyses_count(self, user_id: UUID) -> int:
+        """Deprecated for list views: use get_user_analyses_page, which returns the count."""
+        key = str(user_id)
         try:
             client = _get_supabase()
             res = await _run(
-                lambda: client.table("analyses")
+                lambda: client.table(_ANALYSES_TABLE)
                     .select("id", count="exact")
-                    .eq("user_id", str(user_id))
+                    .eq("user_id", key)
                     .execute()
             )
             return res.count or 0
         except Exception as e:
-            logger.error("Failed to get user analyses count", user_id=str(user_id), error=str(e))
+            logger.error("Failed to get user analyses count", user_id=key, error=str(e))
             raise DatabaseError(f"Failed to get user analyses count: {e}")
 
 
@@ -334,12 +494,34 @@ class DatabaseService:
     async def store_analysis(self, analysis_result: AnalysisResult) -> str:
         return await self.analyses.create_analysis(analysis_result)
 
-    async def get_user_analyses(self, user_id: UUID, limit: int = 50, offset: int = 0) -> List[Analysis]:
-        return await self.analyses.get_user_analyses(user_id, limit, offset)
+    async def get_user_analyses(
+        self,
+        user_id: UUID,
+        limit: int = 50,
+        offset: int = 0,
+        cursor_created_at: Optional[Any] = None,
+        cursor_id: Optional[UUID] = None,
+    ) -> List[Analysis]:
+        return await self.analyses.get_user_analyses(
+            user_id, limit, offset, cursor_created_at, cursor_id
+        )
+
+    async def get_user_analyses_page(
+        self, user_id: UUID, limit: int = 50, offset: int = 0
+    ) -> Tuple[List[Analysis], int]:
+        return await self.analyses.get_user_analyses_page(user_id, limit, offset)
 
     async def get_analysis_by_id(self, analysis_id: UUID) -> Optional[Analysis]:
         return await self.analyses.get_analysis_by_id(analysis_id)
 
+    async def get_dashboard(self, user_id: UUID, recent_limit: int = 10) -> Dict[str, Any]:
+        """Fetch a user's resumes and recent analyses (with total count) concurrently."""
+        resumes, (recent, total) = await asyncio.gather(
+            self.resumes.get_user_resumes(user_id),
+            self.analyses.get_user_analyses_page(user_id, recent_limit, 0),
+        )
+        return {"resumes": resumes, "recent_analyses": recent, "total_analyses": total}
+
 
 # Global instance
 db_service = DatabaseService()
\ No newline at end of file
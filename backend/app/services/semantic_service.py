@@ -6,34 +6,89 @@ import numpy as np
 from typing import List, Dict, Tuple, Optional, Any
 from sentence_transformers import SentenceTransformer
 import spacy
-from sklearn.metrics.pairwise import cosine_similarity
 import asyncio
 from functools import lru_cache
 import hashlib
+import threading
+import time
+import weakref
+from collections import OrderedDict, deque
 
+from app.config import settings
 from app.utils.logger import get_logger
 from app.models.entities import CompatibilityAnalysis
 from app.core.exceptions import SemanticAnalysisError
 
 logger = get_logger(__name__)
 
+# Runs of anything other than word chars and basic punctuation (includes whitespace)
+_PREPROCESS_RE = re.compile(r'[^\w\-\.\,\;\:\!\?]+')
+_WORD_RE = re.compile(r'\S+')
+
+# Keyword normalization drops everything but word chars, whitespace, '-' and '.';
+# ASCII keywords take the str.translate fast path
+_KEYWORD_STRIP_RE = re.compile(r'[^\w\s\-\.]')
+_KEYWORD_STRIP_TABLE = str.maketrans(
+    '', '', ''.join(c for c in map(chr, range(128)) if _KEYWORD_STRIP_RE.match(c))
+)
+
+
+def quantize_embedding(embedding: np.ndarray) -> Tuple[np.ndarray, float]:
+    """Quantize an embedding to int8 with a per-vector scale"""
+    scale = float(np.abs(embedding).max()) / 127 or 1.0
+    return np.round(embedding / scale).astype(np.int8), scale
+
+
+def dequantize_embedding(quantized: np.ndarray, scale: float) -> np.ndarray:
+    """Restore a float32 embedding from quantize_embedding output"""
+    return quantized.astype(np.float32) * np.float32(scale)
+
 
 class EmbeddingGenerator:
     """Generates semantic embeddings using sentence-transformers model"""
     
-    def __init__(self, model_name: str = "sentence-transformers/all-MiniLM-L6-v2"):
+    def __init__(
+        self,
+        model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+        device: Optional[str] = None,
+        max_cache_size: int = 1024,
+        quantize_cache: bool = False,
+        backend: str = "torch"
+    ):
         self.model_name = model_name
+        self.device = device  # None = use CUDA when available, else CPU
+        self.backend = backend  # "torch", or "onnx"/"openvino" (need the matching extras)
         self._model = None
-        self._embedding_cache: Dict[str, np.ndarray] = {}
+        self._model_lock = threading.Lock()
+        self.max_cache_size = max_cache_size
+        # Store cached embeddings as int8 + scale (4x smaller, ~1e-3 precision loss)
+        self.quantize_cache = quantize_cache
+        self._embedding_cache: "OrderedDict[bytes, Any]" = OrderedDict()  # LRU, oldest first
         self.max_chunk_length = 512  # Model's max sequence length
         self.chunk_overlap = 50  # Overlap between chunks
     
     def _get_model(self) -> SentenceTransformer:
         """Lazy load the sentence transformer model"""
-        if self._model is None:
+        if self._model is not None:
+            return self._model
+        # Warmup and the first request may both get here from executor threads
+        with self._model_lock:
+            if self._model is not None:
+                return self._model
             try:
-                logger.info("Loading sentence transformer model", model=self.model_name)
-                self._model = SentenceTransformer(self.model_name)
+                import torch
+                device = self.device or ("cuda" if torch.cuda.is_available() else "cpu")
+                logger.info("Loading sentence transformer model",
+                           model=self.model_name, device=device, backend=self.backend)
+                # Only sentence-transformers >= 3.2 accepts backend=; the default torch
+                # path must keep working on the pinned 2.2.2
+                kwargs = {} if self.backend == "torch" else {"backend": self.backend}
+                model = SentenceTransformer(self.model_name, device=device, **kwargs)
+                if self.backend == "torch" and device.startswith("cuda"):
+                    # FP16 halves memory traffic and runs on tensor cores
+                    model.half()
+                self._model = model
+                self.device = device
                 logger.info("Successfully loaded sentence transformer model")
             except Exception as e:
                 logger.error("Failed to load sentence transformer model", error=str(e))
@@ -42,11 +97,9 @@ class EmbeddingGenerator:
     
     def _preprocess_text(self, text: str) -> str:
         """Preprocess text for embedding generation with length optimization"""
-        # Remove excessive whitespace and normalize
-        text = re.sub(r'\s+', ' ', text.strip())
-        
-        # Remove special characters that might interfere with embeddings
-        text = re.sub(r'[^\w\s\-\.\,\;\:\!\?]', ' ', text)
+        # Replace runs of whitespace and special characters that might interfere
+        # with embeddings by a single space, in one pass
+        text = _PREPROCESS_RE.sub(' ', text).strip()
         
         # PERFORMANCE OPTIMIZATION: Truncate very long texts to prevent slowdown
         max_length = 2000  # Limit to 2000 characters for performance
@@ -67,29 +120,40 @@ class EmbeddingGenerator:
     
     def _chunk_text(self, text: str) -> List[str]:
         """Split long text into overlapping chunks for processing"""
-        words = text.split()
+        spans = [m.span() for m in _WORD_RE.finditer(text)]
         
-        if len(words) <= self.max_chunk_length:
+        if len(spans) <= self.max_chunk_length:
             return [text]
         
+        # Slice each chunk straight out of the text by word offsets instead of
+        # re-joining word lists (preprocessed text is single-space separated)
         chunks = []
-        start = 0
-        
-        while start < len(words):
-            end = min(start + self.max_chunk_length, len(words))
-            chunk = ' '.join(words[start:end])
-            chunks.append(chunk)
-            
-            # Move start position with overlap
-            start = end - self.chunk_overlap
-            if start >= len(words):
+        step = self.max_chunk_length - self.chunk_overlap
+        for start in range(0, len(spans), step):
+            end = min(start + self.max_chunk_length, len(spans))
+            chunks.append(text[spans[start][0]:spans[end - 1][1]])
+            if end == len(spans):
                 break
         
         return chunks
     
-    def _get_cache_key(self, text: str) -> str:
-        """Generate cache key for text"""
-        return hashlib.md5(text.encode('utf-8')).hexdigest()
+    def _get_cache_key(self, text: str) -> bytes:
+        """Generate cache key for text (raw 128-bit BLAKE2b digest, no hex encoding)"""
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+    
+    def _encode(self, model: SentenceTransformer, chunks: List[str]) -> np.ndarray:
+        """Run the model on a batch of chunks (called in an executor thread)"""
+        import torch
+        with torch.inference_mode():
+            embeddings = model.encode(
+                chunks,
+                batch_size=32,
+                show_progress_bar=False,
+                convert_to_numpy=True,
+                normalize_embeddings=True
+            )
+        # FP16 models return half-precision arrays; keep float32 downstream
+        return np.asarray(embeddings, dtype=np.float32)
     
     async def generate_embedding(self, text: str) -> np.ndarray:
         """
@@ -104,57 +168,83 @@ class EmbeddingGenerator:
         Raises:
             SemanticAnalysisError: If embedding generation fails
         """
-        try:
-            # Preprocess text
-            processed_text = self._preprocess_text(text)
-            
-            # Check cache first
-            cache_key = self._get_cache_key(processed_text)
-            if cache_key in self._embedding_cache:
-                logger.debug("Using cached embedding", cache_key=cache_key[:8])
-                return self._embedding_cache[cache_key]
-            
-            # Get model
-            model = self._get_model()
+        return (await self.generate_embeddings_batch([text]))[0]
+    
+    async def generate_embeddings_batch(self, texts: List[str]) -> List[np.ndarray]:
+        """
+        Generate embeddings for several texts with a single model call
+        
+        All uncached texts are chunked into one flat list and encoded together,
+        so the model runs batched forward passes instead of one per chunk.
+        Chunk embeddings are then averaged back per input text.
+        
+        Args:
+            texts: Input texts to embed
             
-            # Chunk text if necessary
-            chunks = self._chunk_text(processed_text)
+        Returns:
+            List of normalized embeddings, one per input text
             
-            if len(chunks) == 1:
-                # Single chunk - direct embedding
-                embedding = await asyncio.get_event_loop().run_in_executor(
-                    None, model.encode, processed_text
+        Raises:
+            SemanticAnalysisError: If embedding generation fails
+        """
+        try:
+            processed = [self._preprocess_text(text) for text in texts]
+            keys = [self._get_cache_key(text) for text in processed]
+            
+            # Resolve cache hits (refreshing their recency) and collect distinct misses
+            cache = self._embedding_cache
+            found: Dict[bytes, np.ndarray] = {}
+            pending: Dict[bytes, str] = {}
+            for key, text in zip(keys, processed):
+                if key in found or key in pending:
+                    continue
+                cached = cache.get(key)
+                if cached is not None:
+                    cache.move_to_end(key)
+                    found[key] = dequantize_embedding(*cached) if self.quantize_cache else cached
+                else:
+                    pending[key] = text
+            
+            if pending:
+                # Flatten all chunks, remembering where each text starts
+                flat_chunks: List[str] = []
+                starts: List[int] = []
+                for text in pending.values():
+                    starts.append(len(flat_chunks))
+                    flat_chunks.extend(self._chunk_text(text))
+                
+                # Resolve the model on the executor too, so a first-time load
+                # never blocks the event loop
+                chunk_embeddings = await asyncio.get_event_loop().run_in_executor(
+                    None, lambda: self._encode(self._get_model(), flat_chunks)
                 )
-            else:
-                # Multiple chunks - generate embeddings and average
-                logger.info("Processing multi-chunk text", num_chunks=len(chunks))
                 
-                chunk_embeddings = []
-                for i, chunk in enumerate(chunks):
-                    chunk_embedding = await asyncio.get_event_loop().run_in_executor(
-                        None, model.encode, chunk
-                    )
-                    chunk_embeddings.append(chunk_embedding)
-                    logger.debug("Processed chunk", chunk_num=i+1, total_chunks=len(chunks))
+                # Average chunk embeddings per text; multi-chunk means are re-normalized
+                # (dividing by the integer counts directly would promote to float64)
+                counts = np.diff(starts + [len(flat_chunks)])
+                sums = np.add.reduceat(chunk_embeddings, starts, axis=0)
+                embeddings = sums / counts[:, None].astype(sums.dtype)
+                multi = counts > 1
+                if multi.any():
+                    embeddings[multi] /= np.linalg.norm(embeddings[multi], axis=1, keepdims=True)
                 
-                # Average the embeddings
-                embedding = np.mean(chunk_embeddings, axis=0)
-            
-            # Normalize the embedding
-            embedding = embedding / np.linalg.norm(embedding)
-            
-            # Cache the result
-            self._embedding_cache[cache_key] = embedding
-            
-            logger.info("Generated embedding", 
-                       text_length=len(text), 
-                       embedding_dim=embedding.shape[0],
-                       num_chunks=len(chunks))
+                for key, embedding in zip(pending, embeddings):
+                    found[key] = embedding
+                    cache[key] = quantize_embedding(embedding) if self.quantize_cache else embedding
+                while len(cache) > self.max_cache_size:
+                    cache.popitem(last=False)
+                
+                logger.info("Generated embeddings",
+                           num_texts=len(pending),
+                           num_chunks=len(flat_chunks),
+                           embedding_dim=embeddings.shape[1])
+            else:
+                logger.debug("Using cached embeddings", num_texts=len(texts))
             
-            return embedding
+            return [found[key] for key in keys]
             
         except Exception as e:
-            logger.error("Failed to generate embedding", error=str(e), text_length=len(text))
+            logger.error("Failed to generate embeddings", error=str(e), num_texts=len(texts))
             raise SemanticAnalysisError(f"Embedding generation failed: {str(e)}")
     
     def clear_cache(self):
@@ -166,6 +256,7 @@ class EmbeddingGenerator:
         """Get cache statistics"""
         return {
             "cache_size": len(self._embedding_cache),
+            "max_cache_size": self.max_cache_size,
             "model_loaded": self._model is not None
         }
 
@@ -181,9 +272,13 @@ class SimilarityCalculator:
         """
         Calculate cosine similarity between two embeddings
         
+        Embeddings from EmbeddingGenerator are L2-normalized, so the cosine
+        similarity is just their dot product; callers passing their own
+        vectors must normalize them first.
+        
         Args:
-            embedding1: First embedding vector
-            embedding2: Second embedding vector
+            embedding1: First (unit-length) embedding vector
+            embedding2: Second (unit-length) embedding vector
             
         Returns:
             Cosine similarity score (-1 to 1)
@@ -192,14 +287,7 @@ class SimilarityCalculator:
             SemanticAnalysisError: If calculation fails
         """
         try:
-            # Ensure embeddings are 2D for sklearn
-            if embedding1.ndim == 1:
-                embedding1 = embedding1.reshape(1, -1)
-            if embedding2.ndim == 1:
-                embedding2 = embedding2.reshape(1, -1)
-            
-            # Calculate cosine similarity
-            similarity = cosine_similarity(embedding1, embedding2)[0, 0]
+            similarity = np.dot(embedding1.ravel(), embedding2.ravel())
             
             # Ensure result is within expected range
             similarity = np.clip(similarity, -1.0, 1.0)
@@ -296,6 +384,49 @@ class SimilarityCalculator:
             "raw_similarity": similarity
         }
     
+    # Lower bounds of the match-quality bands, and their labels in ascending order
+    _QUALITY_BOUNDS = np.array([20.0, 40.0, 60.0, 80.0])
+    _QUALITY_LABELS = np.array(["poor", "weak", "moderate", "good", "excellent"])
+    _CONFIDENCE_LABELS = np.array(["low", "medium", "high"])
+    
+    def score_many(self, query_embedding: np.ndarray, candidate_embeddings: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Score many candidate embeddings against one query embedding at once
+        
+        Vectorized equivalent of interpret_similarity for each row of
+        candidate_embeddings: one matrix-vector product for the similarities,
+        then searchsorted over the threshold arrays instead of per-item branching.
+        
+        Args:
+            query_embedding: Unit-length query embedding, shape (D,)
+            candidate_embeddings: Unit-length candidate embeddings, shape (N, D)
+            
+        Returns:
+            Dictionary of arrays (length N): raw_similarity, percentage,
+            confidence and match_quality
+        """
+        try:
+            similarities = np.clip(candidate_embeddings @ query_embedding.ravel(), -1.0, 1.0)
+            percentages = np.clip((similarities + 1) * 50, 0.0, 100.0)
+            
+            confidence_idx = np.searchsorted(
+                [self.min_confidence_threshold, self.high_confidence_threshold],
+                np.abs(similarities),
+                side="right"
+            )
+            quality_idx = np.searchsorted(self._QUALITY_BOUNDS, percentages, side="right")
+            
+            return {
+                "raw_similarity": similarities,
+                "percentage": percentages,
+                "confidence": self._CONFIDENCE_LABELS[confidence_idx],
+                "match_quality": self._QUALITY_LABELS[quality_idx]
+            }
+            
+        except Exception as e:
+            logger.error("Failed to score candidate embeddings", error=str(e))
+            raise SemanticAnalysisError(f"Batch similarity scoring failed: {str(e)}")
+    
     async def calculate_similarity_with_metrics(
         self, 
         embedding1: np.ndarray, 
@@ -340,9 +471,16 @@ class SimilarityCalculator:
 class KeywordAnalyzer:
     """Intelligent keyword analysis using spaCy NLP"""
     
-    def __init__(self, model_name: str = "en_core_web_sm"):
+    def __init__(self, model_name: str = "en_core_web_sm", max_keyword_cache_size: int = 1024):
         self.model_name = model_name
         self._nlp = None
+        self._nlp_lock = threading.Lock()
+        self._token_matcher = None
+        
+        # LRU of extracted keywords by text digest; extraction runs on executor threads
+        self.max_keyword_cache_size = max_keyword_cache_size
+        self._keyword_cache: "OrderedDict[bytes, List[str]]" = OrderedDict()
+        self._keyword_cache_lock = threading.Lock()
         self.min_keyword_length = 2
         self.max_keyword_length = 50
         
@@ -371,19 +509,43 @@ class KeywordAnalyzer:
             'customer relationship management': ['crm'],
             'enterprise resource planning': ['erp']
         }
+        
+        # Reverse index: every canonical term and synonym -> its whole synonym group
+        self._synonym_index: Dict[str, Tuple[str, ...]] = {}
+        for canonical, synonyms in self.synonym_mappings.items():
+            group = (canonical, *synonyms)
+            for term in group:
+                self._synonym_index[term] = self._synonym_index.get(term, ()) + group
     
     def _get_nlp_model(self):
         """Lazy load the spaCy model"""
-        if self._nlp is None:
+        if self._nlp is not None:
+            return self._nlp
+        # Warmup and keyword extraction may both get here from executor threads
+        with self._nlp_lock:
+            if self._nlp is not None:
+                return self._nlp
             try:
                 logger.info("Loading spaCy model", model=self.model_name)
                 import spacy
-                self._nlp = spacy.load(self.model_name)
+                from spacy.matcher import Matcher
+                nlp = spacy.load(self.model_name)
                 
                 # Add custom stop words
                 for word in self.additional_stop_words:
-                    self._nlp.vocab[word].is_stop = True
+                    nlp.vocab[word].is_stop = True
+                
+                # Single-token keyword candidates, matched in Cython rather than
+                # by a Python loop over every token
+                self._token_matcher = Matcher(nlp.vocab)
+                self._token_matcher.add("KEYWORD_TOKEN", [[{
+                    "POS": {"IN": ["NOUN", "PROPN", "ADJ"]},
+                    "IS_STOP": False,
+                    "IS_PUNCT": False,
+                    "LENGTH": {">=": self.min_keyword_length}
+                }]])
                 
+                self._nlp = nlp
                 logger.info("Successfully loaded spaCy model")
             except Exception as e:
                 logger.error("Failed to load spaCy model", error=str(e))
@@ -419,77 +581,80 @@ class KeywordAnalyzer:
     
     def _normalize_keyword(self, keyword: str) -> str:
         """Normalize keyword for consistent matching"""
-        # Convert to lowercase and strip whitespace
-        normalized = keyword.lower().strip()
-        
-        # Remove extra spaces
-        normalized = re.sub(r'\s+', ' ', normalized)
-        
-        # Remove special characters except hyphens and dots
-        normalized = re.sub(r'[^\w\s\-\.]', '', normalized)
+        # Convert to lowercase and remove special characters except hyphens and dots
+        normalized = keyword.lower()
+        if normalized.isascii():
+            normalized = normalized.translate(_KEYWORD_STRIP_TABLE)
+        else:
+            normalized = _KEYWORD_STRIP_RE.sub('', normalized)
         
-        return normalized
+        # Remove extra spaces last so the result is idempotent
+        return ' '.join(normalized.split())
     
     def _extract_noun_phrases(self, text: str) -> List[str]:
         """Extract noun phrases from text using spaCy"""
+        return self._extract_noun_phrases_batch([text])[0]
+    
+    def _extract_noun_phrases_batch(self, texts: List[str]) -> List[List[str]]:
+        """Extract noun phrases from several texts with one nlp.pipe pass"""
         try:
             nlp = self._get_nlp_model()
             if nlp is None:
                 # Fallback to simple keyword extraction
-                return self._fallback_keyword_extraction(text)
-            
-            doc = nlp(text)
-            
-            noun_phrases = []
-            
-            # Extract noun chunks
-            for chunk in doc.noun_chunks:
-                phrase = chunk.text.strip()
-                normalized = self._normalize_keyword(phrase)
-                
-                # Filter by length and content
-                if (self.min_keyword_length <= len(normalized) <= self.max_keyword_length 
-                    and not chunk.root.is_stop 
-                    and chunk.root.pos_ in ['NOUN', 'PROPN']):
-                    noun_phrases.append(normalized)
+                return [self._fallback_keyword_extraction(text) for text in texts]
             
-            # Extract named entities
-            for ent in doc.ents:
-                if ent.label_ in ['ORG', 'PRODUCT', 'SKILL', 'TECH']:  # Relevant entity types
-                    phrase = ent.text.strip()
-                    normalized = self._normalize_keyword(phrase)
-                    
-                    if self.min_keyword_length <= len(normalized) <= self.max_keyword_length:
-                        noun_phrases.append(normalized)
-            
-            # Extract individual important tokens
-            for token in doc:
-                if (token.pos_ in ['NOUN', 'PROPN', 'ADJ'] 
-                    and not token.is_stop 
-                    and not token.is_punct 
-                    and len(token.text) >= self.min_keyword_length):
-                    normalized = self._normalize_keyword(token.text)
-                    if len(normalized) >= self.min_keyword_length:
-                        noun_phrases.append(normalized)
-            
-            return list(set(noun_phrases))  # Remove duplicates
+            # Lemmas are never read, so skip the lemmatizer
+            disable = [name for name in ('lemmatizer',) if name in nlp.pipe_names]
+            return [
+                self._phrases_from_doc(doc)
+                for doc in nlp.pipe(texts, batch_size=max(len(texts), 1), disable=disable)
+            ]
             
         except Exception as e:
             logger.error("Failed to extract noun phrases", error=str(e))
             raise SemanticAnalysisError(f"Noun phrase extraction failed: {str(e)}")
     
+    def _phrases_from_doc(self, doc) -> List[str]:
+        """Collect normalized noun chunks, entities and important tokens from a parsed doc"""
+        noun_phrases = []
+        
+        # Extract noun chunks
+        for chunk in doc.noun_chunks:
+            phrase = chunk.text.strip()
+            normalized = self._normalize_keyword(phrase)
+            
+            # Filter by length and content
+            if (self.min_keyword_length <= len(normalized) <= self.max_keyword_length 
+                and not chunk.root.is_stop 
+                and chunk.root.pos_ in ['NOUN', 'PROPN']):
+                noun_phrases.append(normalized)
+        
+        # Extract named entities
+        for ent in doc.ents:
+            if ent.label_ in ['ORG', 'PRODUCT', 'SKILL', 'TECH']:  # Relevant entity types
+                phrase = ent.text.strip()
+                normalized = self._normalize_keyword(phrase)
+                
+                if self.min_keyword_length <= len(normalized) <= self.max_keyword_length:
+                    noun_phrases.append(normalized)
+        
+        # Extract individual important tokens
+        for _, start, _ in self._token_matcher(doc):
+            normalized = self._normalize_keyword(doc[start].text)
+            if len(normalized) >= self.min_keyword_length:
+                noun_phrases.append(normalized)
+        
+        return list(set(noun_phrases))  # Remove duplicates
+    
     def _expand_with_synonyms(self, keywords: List[str]) -> List[str]:
         """Expand keywords with synonyms for better matching"""
         expanded = set(keywords)
         
+        index = self._synonym_index
         for keyword in keywords:
-            # Check if keyword has synonyms
-            for canonical, synonyms in self.synonym_mappings.items():
-                if keyword == canonical:
-                    expanded.update(synonyms)
-                elif keyword in synonyms:
-                    expanded.add(canonical)
-                    expanded.update(synonyms)
+            group = index.get(keyword)
+            if group:
+                expanded.update(group)
         
         return list(expanded)
     
@@ -503,31 +668,71 @@ class KeywordAnalyzer:
         Returns:
             List of extracted keywords
         """
-        try:
-            # Extract noun phrases and important terms
-            keywords = self._extract_noun_phrases(text)
-            
-            # Expand with synonyms
-            expanded_keywords = self._expand_with_synonyms(keywords)
-            
-            # Sort by length (longer phrases first) and alphabetically
-            sorted_keywords = sorted(expanded_keywords, key=lambda x: (-len(x), x))
+        return self.extract_keywords_batch([text])[0]
+    
+    def extract_keywords_batch(self, texts: List[str]) -> List[List[str]]:
+        """
+        Extract keywords from several texts, parsing them in one spaCy batch
+        
+        Args:
+            texts: Input texts to analyze
             
-            logger.info("Extracted keywords", 
-                       original_count=len(keywords),
-                       expanded_count=len(expanded_keywords),
-                       text_length=len(text))
+        Returns:
+            List of extracted keyword lists, one per input text
+        """
+        try:
+            keys = [hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest() for text in texts]
+            results: Dict[bytes, List[str]] = {}
+            with self._keyword_cache_lock:
+                for key in keys:
+                    cached = self._keyword_cache.get(key)
+                    if cached is not None:
+                        self._keyword_cache.move_to_end(key)
+                        results[key] = cached
+            
+            pending = {key: text for key, text in zip(keys, texts) if key not in results}
+            if pending:
+                # Extract noun phrases and important terms
+                phrase_lists = self._extract_noun_phrases_batch(list(pending.values()))
+                for (key, text), keywords in zip(pending.items(), phrase_lists):
+                    # Expand with synonyms
+                    expanded_keywords = self._expand_with_synonyms(keywords)
+                    
+                    # Sort by length (longer phrases first) and alphabetically
+                    results[key] = sorted(expanded_keywords, key=lambda x: (-len(x), x))
+                    
+                    logger.info("Extracted keywords", 
+                               original_count=len(keywords),
+                               expanded_count=len(expanded_keywords),
+                               text_length=len(text))
+                
+                # Only cache spaCy results; fallback output would go stale once the model loads
+                if self._nlp is not None:
+                    with self._keyword_cache_lock:
+                        for key in pending:
+                            self._keyword_cache[key] = results[key]
+                        while len(self._keyword_cache) > self.max_keyword_cache_size:
+                            self._keyword_cache.popitem(last=False)
             
-            return sorted_keywords
+            return [list(results[key]) for key in keys]
             
         except Exception as e:
             logger.error("Failed to extract keywords", error=str(e))
             raise SemanticAnalysisError(f"Keyword extraction failed: {str(e)}")
     
+    def clear_cache(self):
+        """Clear the keyword extraction cache"""
+        with self._keyword_cache_lock:
+            self._keyword_cache.clear()
+        logger.info("Cleared keyword cache")
+    
     def match_keywords(self, resume_keywords: List[str], job_keywords: List[str]) -> Tuple[List[str], List[str]]:
         """
         Match keywords between resume and job description
         
+        Keywords are expected as returned by extract_keywords, which already
+        normalizes them, so they are compared as-is.
+        
         Args:
             resume_keywords: Keywords from resume
             job_keywords: Keywords from job description
@@ -536,23 +741,16 @@ class KeywordAnalyzer:
             Tuple of (matched_keywords, missing_keywords)
         """
         try:
-            # Normalize all keywords
-            resume_set = {self._normalize_keyword(kw) for kw in resume_keywords}
-            job_set = {self._normalize_keyword(kw) for kw in job_keywords}
+            resume_set = set(resume_keywords)
+            job_set = set(job_keywords)
             
             # Find exact matches
             matched = resume_set.intersection(job_set)
             
             # Find partial matches (substring matching)
-            additional_matches = set()
-            for job_kw in job_set:
-                if job_kw not in matched:
-                    for resume_kw in resume_set:
-                        if (job_kw in resume_kw or resume_kw in job_kw) and len(job_kw) > 3:
-                            additional_matches.add(job_kw)
-                            break
-            
-            matched.update(additional_matches)
+            candidates = [kw for kw in job_set - matched if len(kw) > 3]
+            if candidates and resume_set:
+                matched.update(self._partial_matches(candidates, resume_set))
             
             # Find missing keywords
             missing = job_set - matched
@@ -572,6 +770,22 @@ class KeywordAnalyzer:
             logger.error("Failed to match keywords", error=str(e))
             raise SemanticAnalysisError(f"Keyword matching failed: {str(e)}")
     
+    def _partial_matches(self, job_keywords: List[str], resume_keywords: set) -> List[str]:
+        """
+        Return the job keywords that contain, or are contained in, any resume keyword
+        
+        Rather than comparing every pair in Python, the resume keywords are
+        joined into one newline-separated haystack (keywords never contain
+        newlines after normalization) and compiled into one alternation, so
+        each job keyword costs one C-level substring search and one regex search.
+        """
+        haystack = "\n".join(resume_keywords)
+        contained = re.compile("|".join(map(re.escape, resume_keywords)))
+        return [
+            kw for kw in job_keywords
+            if kw in haystack or contained.search(kw)
+        ]
+    
     def prioritize_missing_keywords(self, missing_keywords: List[str], job_text: str) -> List[str]:
         """
         Prioritize missing keywords by frequency in job description
@@ -584,17 +798,15 @@ class KeywordAnalyzer:
             List of missing keywords sorted by priority (frequency)
         """
         try:
-            job_text_lower = job_text.lower()
-            keyword_frequencies = {}
-            
-            for keyword in missing_keywords:
-                # Count occurrences (case-insensitive)
-                count = job_text_lower.count(keyword.lower())
-                keyword_frequencies[keyword] = count
+            # Count occurrences (case-insensitive). str.count is a C-level fast
+            # search per keyword; a single alternation sweep would let longer
+            # keywords swallow matches of the keywords nested inside them.
+            count = job_text.lower().count
+            keyword_frequencies = {kw: count(kw.lower()) for kw in set(missing_keywords)}
             
             # Sort by frequency (descending) then alphabetically
             prioritized = sorted(missing_keywords, 
-                               key=lambda x: (-keyword_frequencies.get(x, 0), x))
+                               key=lambda x: (-keyword_frequencies[x], x))
             
             logger.info("Prioritized missing keywords", 
                        total_missing=len(missing_keywords),
@@ -631,9 +843,18 @@ class SemanticService:
     """
     
     def __init__(self):
-        self.embedding_generator = EmbeddingGenerator()
+        self.embedding_generator = EmbeddingGenerator(
+            quantize_cache=settings.EMBEDDING_CACHE_QUANTIZED,
+            backend=settings.EMBEDDING_BACKEND
+        )
         self.similarity_calculator = SimilarityCalculator()
         self.keyword_analyzer = KeywordAnalyzer()
+        # Micro-batching for embed(): callers arriving within the window share one
+        # model call; the worker exits when idle so it never pins the service
+        self.embed_batch_window = 0.005  # seconds
+        self.embed_max_batch = 32
+        self._embed_pending: "deque[Tuple[str, asyncio.Future]]" = deque()
+        self._embed_worker: Optional[asyncio.Task] = None
     
     async def analyze_compatibility(
         self, 
@@ -658,29 +879,25 @@ class SemanticService:
                        resume_length=len(resume_text),
                        job_desc_length=len(job_description))
             
-            # PERFORMANCE OPTIMIZATION: Generate embeddings concurrently
-            logger.info("Generating embeddings")
-            resume_task = asyncio.create_task(
-                self.embedding_generator.generate_embedding(resume_text)
-            )
-            job_task = asyncio.create_task(
-                self.embedding_generator.generate_embedding(job_description)
+            # PERFORMANCE OPTIMIZATION: Embed both documents in one batched model call
+            # while spaCy keyword extraction runs concurrently on an executor thread
+            logger.info("Generating embeddings and extracting keywords")
+            texts = [resume_text, job_description]
+            (resume_embedding, job_embedding), (resume_keywords, job_keywords) = await asyncio.gather(
+                self.embedding_generator.generate_embeddings_batch(texts),
+                asyncio.get_event_loop().run_in_executor(
+                    None, self.keyword_analyzer.extract_keywords_batch, texts
+                )
             )
             
-            # Wait for both embeddings to complete
-            resume_embedding, job_embedding = await asyncio.gather(resume_task, job_task)
-            
             # Calculate semantic similarity
             logger.info("Calculating semantic similarity")
             similarity_metrics = await self.similarity_calculator.calculate_similarity_with_metrics(
                 resume_embedding, job_embedding
             )
             
-            # Extract and match keywords
+            # Match keywords
             logger.info("Analyzing keywords")
-            resume_keywords = self.keyword_analyzer.extract_keywords(resume_text)
-            job_keywords = self.keyword_analyzer.extract_keywords(job_description)
-            
             matched_keywords, missing_keywords = self.keyword_analyzer.match_keywords(
                 resume_keywords, job_keywords
             )
@@ -716,6 +933,25 @@ class SemanticService:
             logger.error("Compatibility analysis failed", error=str(e))
             raise SemanticAnalysisError(f"Compatibility analysis failed: {str(e)}")
     
+    async def warmup(self) -> None:
+        """
+        Load the embedding and spaCy models in parallel and run one dummy encode
+        
+        Meant to be started in the background at application startup so the
+        first real request does not pay for model loading or lazy kernel setup.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            await asyncio.gather(
+                loop.run_in_executor(None, self.embedding_generator._get_model),
+                loop.run_in_executor(None, self.keyword_analyzer._get_nlp_model)
+            )
+            model = self.embedding_generator._get_model()
+            await loop.run_in_executor(None, self.embedding_generator._encode, model, ["warmup"])
+            logger.info("Semantic models warmed up")
+        except Exception as e:
+            logger.warning("Semantic model warmup failed", error=str(e))
+    
     async def generate_embedding_only(self, text: str) -> np.ndarray:
         """
         Generate embedding for a single text (utility method)
@@ -726,7 +962,57 @@ class SemanticService:
         Returns:
             Embedding vector as numpy array
         """
-        return await self.embedding_generator.generate_embedding(text)
+        return await self.embed(text)
+    
+    async def embed(self, text: str) -> np.ndarray:
+        """
+        Embed a single text, coalescing concurrent calls into batched model calls
+        
+        Args:
+            text: Input text
+            
+        Returns:
+            Embedding vector as numpy array
+        """
+        loop = asyncio.get_running_loop()
+        worker = self._embed_worker
+        if worker is not None and worker.get_loop() is not loop:
+            # Requests queued on another (closed) loop can never be resolved
+            self._embed_pending.clear()
+            worker = None
+        
+        future = loop.create_future()
+        self._embed_pending.append((text, future))
+        if worker is None or worker.done():
+            self._embed_worker = loop.create_task(self._drain_embed_queue())
+        return await future
+    
+    async def _drain_embed_queue(self) -> None:
+        """Resolve queued embed() calls in batches until the queue is empty"""
+        pending = self._embed_pending
+        while pending:
+            if len(pending) < self.embed_max_batch:
+                # Give concurrent callers a short window to join this batch
+                await asyncio.sleep(self.embed_batch_window)
+            
+            size = min(len(pending), self.embed_max_batch)
+            batch = [pending.popleft() for _ in range(size)]
+            batch = [(text, future) for text, future in batch if not future.done()]
+            if not batch:
+                continue
+            
+            try:
+                embeddings = await self.embedding_generator.generate_embeddings_batch(
+                    [text for text, _ in batch]
+                )
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            else:
+                for (_, future), embedding in zip(batch, embeddings):
+                    if not future.done():
+                        future.set_result(embedding)
     
     def extract_keywords_only(self, text: str) -> List[str]:
         """
@@ -756,23 +1042,67 @@ class SemanticService:
             "keyword_analyzer_config": {
                 "min_keyword_length": self.keyword_analyzer.min_keyword_length,
                 "max_keyword_length": self.keyword_analyzer.max_keyword_length,
-                "synonym_mappings_count": len(self.keyword_analyzer.synonym_mappings)
+                "synonym_mappings_count": len(self.keyword_analyzer.synonym_mappings),
+                "keyword_cache_size": len(self.keyword_analyzer._keyword_cache)
             }
         }
     
     def clear_caches(self):
         """Clear all internal caches"""
         self.embedding_generator.clear_cache()
+        self.keyword_analyzer.clear_cache()
         logger.info("Cleared all semantic service caches")
 
 
 # Global service instance (will be initialized in main.py)
+# Strong pin, dropped after SEMANTIC_SERVICE_IDLE_TTL without use; the weak
+# reference lets callers still holding the instance keep sharing it
 semantic_service: Optional[SemanticService] = None
+_semantic_service_ref: Optional["weakref.ref[SemanticService]"] = None
+_semantic_service_lock = threading.Lock()
+_semantic_service_last_used = 0.0
+# Idle-TTL timer and the loop it was scheduled on
+_semantic_service_expiry: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.TimerHandle]] = None
+
+
+def _expire_semantic_service() -> None:
+    """Unpin the service once it has been idle for the full TTL, else re-arm"""
+    global semantic_service, _semantic_service_expiry
+    remaining = settings.SEMANTIC_SERVICE_IDLE_TTL - (time.monotonic() - _semantic_service_last_used)
+    if remaining > 0:
+        loop = asyncio.get_running_loop()
+        _semantic_service_expiry = (loop, loop.call_later(remaining, _expire_semantic_service))
+        return
+    _semantic_service_expiry = None
+    semantic_service = None
+    logger.info("Unpinned idle semantic service")
 
 
 def get_semantic_service() -> SemanticService:
     """Get the global semantic service instance"""
-    global semantic_service
-    if semantic_service is None:
-        semantic_service = SemanticService()
-    return semantic_service
\ No newline at end of file
+    global semantic_service, _semantic_service_ref, _semantic_service_last_used, _semantic_service_expiry
+    service = semantic_service
+    if service is None:
+        # Double-checked so concurrent first callers build a single instance
+        with _semantic_service_lock:
+            service = _semantic_service_ref() if _semantic_service_ref is not None else None
+            if service is None:
+                service = SemanticService()
+                _semantic_service_ref = weakref.ref(service)
+            semantic_service = service
+    
+    _semantic_service_last_used = time.monotonic()
+    ttl = settings.SEMANTIC_SERVICE_IDLE_TTL
+    if ttl > 0:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return service  # No loop to time the idle period on; stay pinned
+        expiry = _semantic_service_expiry
+        # Re-arm when there is no live timer on this loop, e.g. after the loop
+        # that scheduled it was closed (tests, TestClient, worker restarts)
+        if expiry is None or expiry[0] is not loop or expiry[1].cancelled():
+            if expiry is not None:
+                expiry[1].cancel()
+            _semantic_service_expiry = (loop, loop.call_later(ttl, _expire_semantic_service))
+    return service
\ No newline at end of file
@@ -55,9 +55,15 @@ class ContextualLogger:
     def __init__(self, logger: logging.Logger):
         self.logger = logger
     
+    def isEnabledFor(self, level: int) -> bool:
+        """Check whether a message at this level would be emitted"""
+        return self.logger.isEnabledFor(level)
+    
     def _log(self, level: int, message: str, **kwargs):
         """Internal logging method with context injection"""
-        extra_fields = kwargs.copy()
+        # Skip building a record that no handler would emit
+        if not self.logger.isEnabledFor(level):
+            return
         
         # Create a log record with extra fields
         record = self.logger.makeRecord(
@@ -69,7 +75,7 @@ class ContextualLogger:
             args=(),
             exc_info=None
         )
-        record.extra_fields = extra_fields
+        record.extra_fields = kwargs
         
         self.logger.handle(record)
     
@@ -4,68 +4,169 @@ Simple database connection test script
 """
 import asyncio
 import asyncpg
+import logging
 import os
+import socket
+import ssl
+from urllib.parse import parse_qs, unquote, urlparse
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-async def test_connection():
-    """Test database connection with different methods"""
-    database_url = os.getenv('DATABASE_URL')
-    print(f"Testing connection to: {database_url}")
-    
-    # Method 1: Direct IPv4 connection
+logger = logging.getLogger(__name__)
+
+# Same knobs the application reads from its settings
+CONNECT_TIMEOUT = float(os.getenv('DB_CONNECT_TIMEOUT', 15.0))
+COMMAND_TIMEOUT = float(os.getenv('DB_COMMAND_TIMEOUT', 10.0))
+
+# Built once and shared by both probes. Matches sslmode=require (encrypted,
+# unverified): the direct probe connects by IP, so hostname checks cannot pass
+_SSL_CONTEXT = ssl.create_default_context()
+_SSL_CONTEXT.check_hostname = False
+_SSL_CONTEXT.verify_mode = ssl.CERT_NONE
+
+# Hosts that only accept TLS connections
+_SUPABASE_DOMAINS = ('.supabase.co', '.supabase.com')
+
+# Failures every method would hit the same way; no point waiting on the others
+_NON_RETRYABLE = (
+    asyncpg.InvalidPasswordError,
+    asyncpg.InvalidAuthorizationSpecificationError,
+    asyncpg.InvalidCatalogNameError,
+)
+
+def _ssl_for(url):
+    """SSL argument for asyncpg.connect: the shared context for Supabase hosts
+
+    An sslmode given in the URL is passed through (the direct probe connects
+    by keyword, not by URL); any other host keeps asyncpg's default 'prefer',
+    so local non-TLS databases still connect.
+    """
+    sslmode = parse_qs(url.query).get('sslmode')
+    if sslmode:
+        return sslmode[0]
+    if (url.hostname or '').endswith(_SUPABASE_DOMAINS):
+        return _SSL_CONTEXT
+    return None
+
+def _mask_url(database_url):
+    """Return the URL with its password masked, for logging"""
+    url = urlparse(database_url)
+    if not url.password:
+        return database_url
+    userinfo, _, host = url.netloc.rpartition('@')
+    user = userinfo.split(':', 1)[0]
+    return url._replace(netloc=f"{user}:***@{host}").geturl()
+
+async def _try_ipv4(database_url):
+    """Method 1: Direct IPv4 connection to the DATABASE_URL host"""
     try:
-        print("\n=== Testing IPv4 Direct Connection ===")
-        pool = await asyncio.wait_for(
-            asyncpg.create_pool(
-                host='104.18.38.10',
-                port=5432,
-                user='postgres',
-                password='SParshitha06',
-                database='postgres',
-                ssl='require',
-                min_size=1,
-                max_size=2,
-                command_timeout=10
-            ),
-            timeout=15.0
-        )
+        url = urlparse(database_url)
+        port = url.port or 5432
+        
+        # One deadline for DNS and connect; unlike wait_for this does not wrap
+        # the connect in an extra task, so a timeout cancels it in place
+        async with asyncio.timeout(CONNECT_TIMEOUT):
+            addrs = await asyncio.get_running_loop().getaddrinfo(
+                url.hostname, port, family=socket.AF_INET, type=socket.SOCK_STREAM
+            )
+            
+            # A single connection is enough for a one-shot SELECT 1; a pool would
+            # only add holder allocations and a reset query on release, and the
+            # prepared-statement cache would never see a second query
+            conn = await asyncpg.connect(
+                host=addrs[0][4][0],
+                port=port,
+                user=unquote(url.username or 'postgres'),
+                password=unquote(url.password or ''),
+                database=url.path.lstrip('/') or 'postgres',
+                ssl=_ssl_for(url),
+                statement_cache_size=0,
+                command_timeout=COMMAND_TIMEOUT
+            )
         
-        async with pool.acquire() as conn:
+        try:
             result = await conn.fetchval("SELECT 1")
             print(f"✅ IPv4 connection successful! Result: {result}")
-        
-        await pool.close()
+        finally:
+            await conn.close()
         return True
         
+    except _NON_RETRYABLE as e:
+        print(f"❌ IPv4 connection failed (not retryable): {e}")
+        raise
     except Exception as e:
         print(f"❌ IPv4 connection failed: {e}")
-    
-    # Method 2: Original URL
+        return False
+
+async def _try_url(database_url):
+    """Method 2: Original URL"""
     try:
-        print("\n=== Testing Original URL ===")
-        pool = await asyncio.wait_for(
-            asyncpg.create_pool(database_url, min_size=1, max_size=2),
-            timeout=15.0
-        )
+        async with asyncio.timeout(CONNECT_TIMEOUT):
+            conn = await asyncpg.connect(
+                database_url,
+                ssl=_ssl_for(urlparse(database_url)),
+                statement_cache_size=0,
+                command_timeout=COMMAND_TIMEOUT
+            )
         
-        async with pool.acquire() as conn:
+        try:
             result = await conn.fetchval("SELECT 1")
             print(f"✅ Original URL connection successful! Result: {result}")
-        
-        await pool.close()
+        finally:
+            await conn.close()
         return True
         
+    except _NON_RETRYABLE as e:
+        print(f"❌ Original URL connection failed (not retryable): {e}")
+        raise
     except Exception as e:
         print(f"❌ Original URL connection failed: {e}")
+        return False
+
+async def test_connection():
+    """Test database connection with different methods"""
+    database_url = os.getenv('DATABASE_URL')
+    if not database_url:
+        print("❌ DATABASE_URL is not set")
+        return False
+    logger.info("Testing connection to: %s", _mask_url(database_url))
+    
+    # Run both methods concurrently and stop at the first success, so a
+    # failing method no longer delays the other by its full timeout
+    print("\n=== Testing IPv4 Direct Connection and Original URL ===")
+    pending = {
+        asyncio.create_task(_try_ipv4(database_url)),
+        asyncio.create_task(_try_url(database_url)),
+    }
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            if any(task.exception() is None and task.result() for task in done):
+                return True
+            if any(task.exception() is not None for task in done):
+                # Bad credentials or a missing database fail every method
+                return False
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
     
     return False
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
+    # uvloop (pulled in by uvicorn[standard]) has faster socket and TLS paths
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
     success = asyncio.run(test_connection())
     if success:
         print("\n🎉 Database connection test PASSED!")
     else:
-        print("\n💥 Database connection test FAILED!")
\ No newline at end of file
+        print("\n💥 Database connection test FAILED!")
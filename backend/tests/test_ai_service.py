@@ -17,7 +17,10 @@ from app.services.ai_service import (
     AIFeedback,
     CircuitBreaker,
     CircuitBreakerConfig,
-    CircuitBreakerState
+    CircuitBreakerState,
+    FeedbackCache,
+    JsonSpanScanner,
+    PromptBatcher
 )
 from app.core.exceptions import AIServiceError, APIRateLimitError
 
@@ -120,7 +123,7 @@ class TestGeminiClient:
         # Force circuit breaker to open state and set last failure time to recent
         import time
         gemini_client.circuit_breaker.state = CircuitBreakerState.OPEN
-        gemini_client.circuit_breaker.last_failure_time = time.time()  # Recent failure
+        gemini_client.circuit_breaker.last_failure_ns = time.monotonic_ns()  # Recent failure
         
         with pytest.raises(AIServiceError) as exc_info:
             await gemini_client.generate_response("test prompt")
@@ -151,6 +154,160 @@ class TestGeminiClient:
             assert 'error' in health
 
 
+def _streamed(*chunks):
+    """Build a mock for generate_content_stream yielding the given text chunks"""
+    async def _stream():
+        for chunk in chunks:
+            yield Mock(text=chunk)
+    return AsyncMock(side_effect=lambda **kwargs: _stream())
+
+
+class TestGeminiClientStreaming:
+    """Test streamed responses and de-duplication of concurrent identical requests"""
+
+    @pytest.fixture
+    def gemini_client(self):
+        client = GeminiClient()
+        client.client = Mock()
+        return client
+
+    @pytest.mark.asyncio
+    async def test_streamed_json_span_is_located(self, gemini_client):
+        """Test JSON split across chunks is located while streaming"""
+        gemini_client.client.aio.models.generate_content_stream = _streamed(
+            'Here you go: {"overall_assessment": "Go',
+            'od", "strengths": ["a {b}"]}',
+            ' trailing text'
+        )
+
+        text, json_span = await gemini_client.generate_response_with_json("prompt")
+
+        assert text.endswith("trailing text")
+        assert json.loads(json_span) == {"overall_assessment": "Good", "strengths": ["a {b}"]}
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_prompts_share_one_call(self, gemini_client):
+        """Test identical in-flight prompts issue a single API call"""
+        stream = _streamed("Shared response")
+        gemini_client.client.aio.models.generate_content_stream = stream
+
+        results = await asyncio.gather(
+            gemini_client.generate_response("same prompt"),
+            gemini_client.generate_response("same prompt"),
+            gemini_client.generate_response("same prompt")
+        )
+
+        assert results == ["Shared response"] * 3
+        assert stream.call_count == 1
+        assert gemini_client._inflight == {}
+
+    @pytest.mark.asyncio
+    async def test_cancelled_owner_does_not_cancel_waiters(self, gemini_client):
+        """Test cancelling the caller that started a shared request spares the others"""
+        release = asyncio.Event()
+        
+        async def _stream():
+            await release.wait()
+            yield Mock(text="Shared response")
+        
+        stream = AsyncMock(side_effect=lambda **kwargs: _stream())
+        gemini_client.client.aio.models.generate_content_stream = stream
+        
+        owner = asyncio.create_task(gemini_client.generate_response("same prompt"))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(gemini_client.generate_response("same prompt"))
+        await asyncio.sleep(0)
+        
+        owner.cancel()
+        release.set()
+        
+        assert await waiter == "Shared response"
+        assert owner.cancelled()
+        assert stream.call_count == 1
+        assert gemini_client._inflight == {}
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_failure_propagates_to_all_callers(self, gemini_client):
+        """Test a failed shared request raises for every waiting caller"""
+        stream = AsyncMock(side_effect=Exception("api key invalid"))
+        gemini_client.client.aio.models.generate_content_stream = stream
+
+        results = await asyncio.gather(
+            gemini_client.generate_response("same prompt"),
+            gemini_client.generate_response("same prompt"),
+            return_exceptions=True
+        )
+
+        assert all(isinstance(r, AIServiceError) for r in results)
+        assert stream.call_count == 1
+
+
+class TestSimulatedFeedback:
+    """Test the static response used when no API key is configured"""
+
+    @pytest.mark.asyncio
+    async def test_simulated_response_skips_extraction(self):
+        client = GeminiClient()
+        client._initialized = True
+
+        text, json_span = await client.generate_response_with_json("prompt")
+
+        assert json_span == text
+        assert client._inflight == {}
+
+        feedback = ResponseParser().parse_response(text, json_span)
+        assert len(feedback.priority_improvements) == 3
+        assert feedback.parsing_confidence > 0.5
+
+
+class TestGeminiClientInitialization:
+    """Test lazy, off-loop creation of the SDK client"""
+
+    @pytest.mark.asyncio
+    async def test_client_created_once_on_initialize(self):
+        client = GeminiClient()
+        client.api_key = "test-key"
+        assert client.client is None
+
+        with patch('app.services.ai_service.genai.Client') as mock_client_cls:
+            await asyncio.gather(client.initialize(), client.initialize())
+            await client.initialize()
+
+        mock_client_cls.assert_called_once_with(api_key="test-key")
+        assert client.client is mock_client_cls.return_value
+
+    @pytest.mark.asyncio
+    async def test_injected_client_is_kept(self):
+        client = GeminiClient()
+        injected = Mock()
+        client.client = injected
+
+        await client.initialize()
+
+        assert client.client is injected
+
+
+class TestJsonSpanScanner:
+    """Test incremental JSON object detection"""
+
+    def test_nested_object_across_chunks(self):
+        scanner = JsonSpanScanner()
+        assert scanner.feed('prefix {"a": {"b": 1}') is False
+        assert scanner.feed(', "c": "}"} suffix') is True
+        assert scanner.span == '{"a": {"b": 1}, "c": "}"}'
+
+    def test_escaped_quote_inside_string(self):
+        scanner = JsonSpanScanner()
+        assert scanner.feed('{"a": "say \\"{\\""}') is True
+        assert json.loads(scanner.span) == {"a": 'say "{"'}
+
+    def test_incomplete_object(self):
+        scanner = JsonSpanScanner()
+        assert scanner.feed('no json here') is False
+        assert scanner.feed('{"a": 1') is False
+        assert scanner.span is None
+
+
 class TestCircuitBreaker:
     """Test circuit breaker functionality"""
     
@@ -181,7 +338,7 @@ class TestCircuitBreaker:
         
         # Simulate time passage
         import time
-        circuit_breaker.last_failure_time = time.time() - 10  # 10 seconds ago
+        circuit_breaker.last_failure_ns = time.monotonic_ns() - 10 * 1_000_000_000  # 10 seconds ago
         
         assert circuit_breaker.can_execute() is True
         assert circuit_breaker.state == CircuitBreakerState.HALF_OPEN
@@ -315,6 +472,17 @@ class TestPromptEngine:
         assert "0.0%" in prompt
         assert "skill0, skill1" in prompt  # Should truncate long lists
         assert len(prompt) > 1000  # Should still generate substantial prompt
+        assert "keyword14" in prompt
+        assert "keyword15" not in prompt
+
+    def test_analysis_context_is_frozen_with_precomputed_slices(self, sample_context):
+        """Test keyword lists are stored as tuples and sliced once"""
+        assert sample_context.matched_keywords == ('Python', 'JavaScript', 'API')
+        assert sample_context.missing_top15 == ('Docker', 'AWS', 'Kubernetes')
+        assert sample_context.missing_top5 == ('Docker', 'AWS', 'Kubernetes')
+
+        with pytest.raises(AttributeError):
+            sample_context.match_score = 99.0
 
 
 class TestResponseParser:
@@ -378,6 +546,65 @@ class TestResponseParser:
         assert len(feedback.strengths) == 2
         assert feedback.parsing_confidence > 0.5
     
+    def test_parse_deeply_nested_json_without_code_blocks(self, response_parser):
+        """Test balanced-brace extraction handles nesting beyond two levels"""
+        json_response = (
+            'Analysis: {"overall_assessment": "Good", "strengths": ["Python"], '
+            '"priority_improvements": [], '
+            '"missing_keywords_analysis": {"detail": {"level": {"deep": "{not a brace}"}}}} done'
+        )
+        
+        feedback = response_parser.parse_response(json_response)
+        
+        assert feedback.overall_assessment == "Good"
+        assert feedback.missing_keywords_analysis["detail"]["level"]["deep"] == "{not a brace}"
+    
+    def test_parse_json_after_unbalanced_brace_in_prose(self, response_parser):
+        """Test a stray unclosed brace before the JSON does not hide the object"""
+        json_response = (
+            'Use {name for the placeholder, then: '
+            '{"overall_assessment": "Good", "strengths": ["Python"], '
+            '"priority_improvements": []} Thanks'
+        )
+        
+        feedback = response_parser.parse_response(json_response)
+        
+        assert feedback.overall_assessment == "Good"
+        assert feedback.strengths == ["Python"]
+    
+    def test_parse_unbalanced_braces_is_fast(self, response_parser):
+        """Test pathological unbalanced input does not backtrack"""
+        import time
+        start = time.monotonic()
+        
+        feedback = response_parser.parse_response("{" * 20000 + "overall_assessment: fine")
+        
+        assert time.monotonic() - start < 2.0
+        assert feedback is not None
+    
+    def test_validate_coerces_loose_types(self, response_parser):
+        """Test validation coerces the loose shapes the model sometimes returns"""
+        raw = json.dumps({
+            "overall_assessment": ["Solid", "Needs polish"],
+            "strengths": "Python",
+            "priority_improvements": ["Add metrics", {"category": "Skills"}, 42],
+        })
+        
+        feedback = response_parser.parse_response(raw)
+        
+        assert feedback.overall_assessment == "Solid. Needs polish"
+        assert feedback.strengths == ["Python"]
+        assert len(feedback.priority_improvements) == 2
+        assert feedback.priority_improvements[0] == {
+            'category': 'General',
+            'priority': 'Medium',
+            'recommendation': 'Add metrics',
+            'impact': 'Will improve resume quality'
+        }
+        assert feedback.priority_improvements[1]['category'] == 'Skills'
+        assert feedback.ats_optimization_tips == []
+        assert feedback.raw_response == raw
+    
     def test_parse_malformed_json(self, response_parser):
         """Test parsing of malformed JSON"""
         malformed_response = '''
@@ -514,13 +741,92 @@ class TestResponseParser:
         assert confidence < 0.5
 
 
+class TestFeedbackCache:
+    """Test exact and semantic feedback caching"""
+    
+    @staticmethod
+    def _feedback(label):
+        return AIFeedback(
+            overall_assessment=label,
+            match_score_interpretation='',
+            strengths=[],
+            priority_improvements=[],
+            missing_keywords_analysis={},
+            ats_optimization_tips=[]
+        )
+    
+    def test_lru_eviction(self):
+        cache = FeedbackCache(maxsize=2)
+        cache.put(b'a', self._feedback('a'))
+        cache.put(b'b', self._feedback('b'))
+        cache.get(b'a')  # 'b' is now least recently used
+        cache.put(b'c', self._feedback('c'))
+        
+        assert cache.get(b'b') is None
+        assert cache.get(b'a').overall_assessment == 'a'
+        assert len(cache) == 2
+    
+    def test_callers_cannot_mutate_cached_feedback(self):
+        cache = FeedbackCache()
+        feedback = self._feedback('a')
+        cache.put(b'a', feedback)
+        feedback.strengths.append('stored')
+        cache.get(b'a').strengths.append('returned')
+        
+        assert cache.get(b'a').strengths == []
+    
+    def test_semantic_match_requires_both_vectors(self):
+        import numpy as np
+        cache = FeedbackCache(threshold=0.95)
+        vectors = np.array([[1.0, 0.0], [0.0, 1.0]])
+        cache.put(b'a', self._feedback('a'), vectors)
+        
+        assert cache.find_similar(vectors).overall_assessment == 'a'
+        # Same resume, different job description
+        assert cache.find_similar(np.array([[1.0, 0.0], [1.0, 0.0]])) is None
+
+
+class TestPromptBatcher:
+    """Test coalescing of concurrent prompts into one Gemini call"""
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_prompts_share_one_call(self):
+        client = Mock()
+        client.generate_response = AsyncMock(return_value=(
+            '###REQ 1###\n{"answer": 1}\n###REQ 2###\nno json here'
+        ))
+        batcher = PromptBatcher(AsyncMock(return_value=client), max_size=8, window_seconds=0.05)
+        
+        first, second = await asyncio.gather(batcher.submit("one"), batcher.submit("two"))
+        
+        assert client.generate_response.call_count == 1
+        combined = client.generate_response.call_args[0][0]
+        assert "###REQ 1###\none" in combined and "###REQ 2###\ntwo" in combined
+        assert first == ('{"answer": 1}', '{"answer": 1}')
+        assert second == ('no json here', None)
+    
+    @pytest.mark.asyncio
+    async def test_missing_answer_raises(self):
+        client = Mock()
+        client.generate_response = AsyncMock(return_value='###REQ 1###\n{"answer": 1}')
+        batcher = PromptBatcher(AsyncMock(return_value=client), max_size=8, window_seconds=0.05)
+        
+        results = await asyncio.gather(
+            batcher.submit("one"), batcher.submit("two"), return_exceptions=True
+        )
+        
+        assert results[0][1] == '{"answer": 1}'
+        assert isinstance(results[1], AIServiceError)
+
+
 class TestAIService:
     """Test complete AI service integration"""
     
     @pytest.fixture
     def ai_service(self):
-        with patch('app.services.ai_service.gemini_client'):
-            return AIService()
+        service = AIService()
+        service.gemini_client = Mock()
+        return service
     
     @pytest.fixture
     def sample_context(self):
@@ -555,7 +861,7 @@ class TestAIService:
         ```
         '''
         
-        with patch.object(ai_service.gemini_client, 'generate_response', new_callable=AsyncMock, return_value=mock_response):
+        with patch.object(ai_service.gemini_client, 'generate_response_with_json', new_callable=AsyncMock, return_value=(mock_response, None)):
             feedback = await ai_service.generate_feedback(sample_context)
             
             assert isinstance(feedback, AIFeedback)
@@ -563,6 +869,25 @@ class TestAIService:
             assert len(feedback.strengths) == 2
             assert len(feedback.priority_improvements) == 1
     
+    @pytest.mark.asyncio
+    async def test_generate_feedback_served_from_cache(self, ai_service, sample_context):
+        """Test identical requests reuse cached feedback"""
+        mock_response = json.dumps({
+            "overall_assessment": "Cached",
+            "strengths": ["Python"],
+            "priority_improvements": []
+        })
+        
+        with patch.object(ai_service.gemini_client, 'generate_response_with_json', new_callable=AsyncMock, return_value=(mock_response, None)) as mock_generate:
+            first = await ai_service.generate_feedback(sample_context)
+            second = await ai_service.generate_feedback(sample_context)
+            
+            # Cache hits are copies, so callers cannot mutate the cached entry
+            assert second is not first
+            assert second.overall_assessment == first.overall_assessment
+            assert second.strengths == first.strengths
+            assert mock_generate.call_count == 1
+    
     @pytest.mark.asyncio
     async def test_generate_feedback_with_fallback(self, ai_service, sample_context):
         """Test feedback generation with fallback prompt"""
@@ -580,9 +905,9 @@ class TestAIService:
         async def mock_generate_side_effect(*args, **kwargs):
             if mock_generate.call_count == 1:
                 raise AIServiceError("Main prompt failed", "gemini")
-            return fallback_response
+            return fallback_response, None
         
-        with patch.object(ai_service.gemini_client, 'generate_response', new_callable=AsyncMock) as mock_generate:
+        with patch.object(ai_service.gemini_client, 'generate_response_with_json', new_callable=AsyncMock) as mock_generate:
             mock_generate.side_effect = mock_generate_side_effect
             
             feedback = await ai_service.generate_feedback(sample_context)
@@ -593,7 +918,7 @@ class TestAIService:
     @pytest.mark.asyncio
     async def test_generate_feedback_complete_failure(self, ai_service, sample_context):
         """Test feedback generation when both main and fallback fail"""
-        with patch.object(ai_service.gemini_client, 'generate_response', new_callable=AsyncMock, side_effect=AIServiceError("Complete failure", "gemini")):
+        with patch.object(ai_service.gemini_client, 'generate_response_with_json', new_callable=AsyncMock, side_effect=AIServiceError("Complete failure", "gemini")):
             with pytest.raises(AIServiceError) as exc_info:
                 await ai_service.generate_feedback(sample_context)
             
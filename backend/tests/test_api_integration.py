@@ -242,7 +242,7 @@ class TestAnalysisEndpoints:
         
         # Mock AI feedback
         mock_feedback = Mock()
-        mock_feedback.dict.return_value = {
+        mock_feedback.to_dict.return_value = {
             "recommendations": [
                 {"category": "skills", "priority": "high", "suggestion": "Add Docker experience"}
             ],
@@ -317,9 +317,8 @@ class TestHistoryEndpoints:
         self.mock_user = {"user_id": self.test_user_id}
     
     @patch('app.middleware.auth.get_current_user')
-    @patch('app.services.database_service.db_service.get_user_analyses')
-    @patch('app.services.database_service.db_service.analyses.get_user_analyses_count')
-    def test_get_user_analyses_success(self, mock_count, mock_get_analyses, mock_auth):
+    @patch('app.services.database_service.db_service.get_user_analyses_page')
+    def test_get_user_analyses_success(self, mock_get_page, mock_auth):
         """Test successful retrieval of user analyses"""
         mock_auth.return_value = self.mock_user
         
@@ -340,8 +339,7 @@ class TestHistoryEndpoints:
         mock_analysis2.missing_keywords = ["Node.js"]
         mock_analysis2.created_at = datetime.utcnow()
         
-        mock_get_analyses.return_value = [mock_analysis1, mock_analysis2]
-        mock_count.return_value = 2
+        mock_get_page.return_value = ([mock_analysis1, mock_analysis2], 2)
         
         response = self.client.get("/api/v1/analyses?page=1&page_size=10")
         
@@ -494,7 +492,7 @@ class TestEndToEndWorkflow:
         mock_semantic.return_value = mock_compatibility
         
         mock_feedback = Mock()
-        mock_feedback.dict.return_value = {
+        mock_feedback.to_dict.return_value = {
             "recommendations": [
                 {
                     "category": "skills",
@@ -540,7 +538,7 @@ class TestEndToEndWorkflow:
         mock_stored_analysis.job_title = "Senior Python Developer"
         mock_stored_analysis.job_description = job_description
         mock_stored_analysis.match_score = 94.2
-        mock_stored_analysis.ai_feedback = mock_feedback.dict()
+        mock_stored_analysis.ai_feedback = mock_feedback.to_dict()
         mock_stored_analysis.matched_keywords = mock_compatibility.matched_keywords
         mock_stored_analysis.missing_keywords = mock_compatibility.missing_keywords
         mock_stored_analysis.resume_id = resume_id
@@ -602,22 +600,20 @@ class TestErrorHandlingAndEdgeCases:
         with patch('app.middleware.auth.get_current_user') as mock_auth:
             mock_auth.return_value = self.mock_user
             
-            with patch('app.services.database_service.db_service.get_user_analyses') as mock_get_analyses:
-                with patch('app.services.database_service.db_service.analyses.get_user_analyses_count') as mock_count:
-                    mock_get_analyses.return_value = []
-                    mock_count.return_value = 0
-                    
-                    # Test with page 0 (should be rejected)
-                    response = self.client.get("/api/v1/analyses?page=0")
-                    assert response.status_code == 422
-                    
-                    # Test with negative page size
-                    response = self.client.get("/api/v1/analyses?page_size=-1")
-                    assert response.status_code == 422
-                    
-                    # Test with page size exceeding limit
-                    response = self.client.get("/api/v1/analyses?page_size=200")
-                    assert response.status_code == 422
+            with patch('app.services.database_service.db_service.get_user_analyses_page') as mock_get_page:
+                mock_get_page.return_value = ([], 0)
+                
+                # Test with page 0 (should be rejected)
+                response = self.client.get("/api/v1/analyses?page=0")
+                assert response.status_code == 422
+                
+                # Test with negative page size
+                response = self.client.get("/api/v1/analyses?page_size=-1")
+                assert response.status_code == 422
+                
+                # Test with page size exceeding limit
+                response = self.client.get("/api/v1/analyses?page_size=200")
+                assert response.status_code == 422
 
 
 # Pytest markers for test organization
@@ -5,6 +5,7 @@ authentication, authorization, and error handling.
 """
 import pytest
 import asyncio
+import dataclasses
 import tempfile
 import os
 from pathlib import Path
@@ -488,9 +489,8 @@ class TestHistoryEndpoints:
         self.mock_user = {"user_id": self.test_user_id}
     
     @patch('app.middleware.auth.get_current_user')
-    @patch('app.services.database_service.db_service.get_user_analyses')
-    @patch('app.services.database_service.db_service.analyses.get_user_analyses_count')
-    def test_get_user_analyses_success(self, mock_count, mock_get_analyses, mock_auth):
+    @patch('app.services.database_service.db_service.get_user_analyses_page')
+    def test_get_user_analyses_success(self, mock_get_page, mock_auth):
         """Test successful retrieval of user analyses"""
         mock_auth.return_value = self.mock_user
         
@@ -525,8 +525,7 @@ class TestHistoryEndpoints:
                 created_at=datetime.utcnow()
             )
         ]
-        mock_get_analyses.return_value = mock_analyses
-        mock_count.return_value = 2
+        mock_get_page.return_value = (mock_analyses, 2)
         
         response = self.client.get("/api/v1/analyses?page=1&page_size=10")
         
@@ -837,7 +836,7 @@ class TestEndToEndWorkflow:
                 job_title="Senior Python Developer",
                 job_description=job_description,
                 match_score=94.2,
-                ai_feedback=mock_feedback.dict(),
+                ai_feedback=dataclasses.asdict(mock_feedback),
                 matched_keywords=mock_compatibility.matched_keywords,
                 missing_keywords=mock_compatibility.missing_keywords,
                 processing_time=2.5,
@@ -980,22 +979,20 @@ class TestErrorHandlingAndEdgeCases:
         with patch('app.middleware.auth.get_current_user') as mock_auth:
             mock_auth.return_value = self.mock_user
             
-            with patch('app.services.database_service.db_service.get_user_analyses') as mock_get_analyses:
-                with patch('app.services.database_service.db_service.analyses.get_user_analyses_count') as mock_count:
-                    mock_get_analyses.return_value = []
-                    mock_count.return_value = 0
-                    
-                    # Test with page 0 (should be rejected)
-                    response = self.client.get("/api/v1/analyses?page=0")
-                    assert response.status_code == 422
-                    
-                    # Test with negative page size
-                    response = self.client.get("/api/v1/analyses?page_size=-1")
-                    assert response.status_code == 422
-                    
-                    # Test with page size exceeding limit
-                    response = self.client.get("/api/v1/analyses?page_size=200")
-                    assert response.status_code == 422
+            with patch('app.services.database_service.db_service.get_user_analyses_page') as mock_get_page:
+                mock_get_page.return_value = ([], 0)
+                
+                # Test with page 0 (should be rejected)
+                response = self.client.get("/api/v1/analyses?page=0")
+                assert response.status_code == 422
+                
+                # Test with negative page size
+                response = self.client.get("/api/v1/analyses?page_size=-1")
+                assert response.status_code == 422
+                
+                # Test with page size exceeding limit
+                response = self.client.get("/api/v1/analyses?page_size=200")
+                assert response.status_code == 422
 
 
 # Pytest markers for test organization
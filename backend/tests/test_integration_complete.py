@@ -120,7 +120,7 @@ class TestSystemIntegrationComplete:
         
         # Mock AI feedback
         mock_feedback = Mock()
-        mock_feedback.dict.return_value = {
+        mock_feedback.to_dict.return_value = {
             "recommendations": [
                 {
                     "category": "skills",
@@ -174,7 +174,7 @@ class TestSystemIntegrationComplete:
         mock_stored_analysis.job_title = "Full Stack Developer"
         mock_stored_analysis.job_description = job_description
         mock_stored_analysis.match_score = 88.5
-        mock_stored_analysis.ai_feedback = mock_feedback.dict()
+        mock_stored_analysis.ai_feedback = mock_feedback.to_dict()
         mock_stored_analysis.matched_keywords = mock_compatibility.matched_keywords
         mock_stored_analysis.missing_keywords = mock_compatibility.missing_keywords
         mock_stored_analysis.processing_time = 2.1
@@ -232,7 +232,7 @@ class TestSystemIntegrationComplete:
         def mock_ai_with_delay(*args, **kwargs):
             time.sleep(0.2)  # Simulate AI processing
             mock_feedback = Mock()
-            mock_feedback.dict.return_value = {
+            mock_feedback.to_dict.return_value = {
                 "recommendations": [{"category": "skills", "suggestion": "Add Docker"}],
                 "overall_assessment": "Good technical foundation",
                 "priority_improvements": ["Docker"],
@@ -360,9 +360,8 @@ class TestSystemIntegrationComplete:
         print("✅ Health check integration test passed")
     
     @patch('app.middleware.auth.get_current_user')
-    @patch('app.services.database_service.db_service.get_user_analyses')
-    @patch('app.services.database_service.db_service.analyses.get_user_analyses_count')
-    def test_data_isolation_integration(self, mock_count, mock_get_analyses, mock_auth):
+    @patch('app.services.database_service.db_service.get_user_analyses_page')
+    def test_data_isolation_integration(self, mock_get_page, mock_auth):
         """Test that user data is properly isolated"""
         
         # Test with user 1
@@ -376,8 +375,7 @@ class TestSystemIntegrationComplete:
         mock_analysis1.match_score = 85.0
         mock_analysis1.created_at = datetime.utcnow()
         
-        mock_get_analyses.return_value = [mock_analysis1]
-        mock_count.return_value = 1
+        mock_get_page.return_value = ([mock_analysis1], 1)
         
         response = self.client.get("/api/v1/analyses")
         assert response.status_code == 200
@@ -396,8 +394,7 @@ class TestSystemIntegrationComplete:
         mock_analysis2.match_score = 92.0
         mock_analysis2.created_at = datetime.utcnow()
         
-        mock_get_analyses.return_value = [mock_analysis2]
-        mock_count.return_value = 1
+        mock_get_page.return_value = ([mock_analysis2], 1)
         
         response = self.client.get("/api/v1/analyses")
         assert response.status_code == 200
@@ -1,6 +1,7 @@
 """
 Unit tests for semantic analysis service
 """
+import asyncio
 import pytest
 import numpy as np
 from unittest.mock import Mock, patch, AsyncMock
@@ -8,7 +9,9 @@ from app.services.semantic_service import (
     EmbeddingGenerator, 
     SimilarityCalculator, 
     KeywordAnalyzer,
-    SemanticService
+    SemanticService,
+    quantize_embedding,
+    dequantize_embedding
 )
 from app.models.entities import CompatibilityAnalysis
 
@@ -48,13 +51,24 @@ class TestEmbeddingGenerator:
         assert len(first_chunk_words) == 512  # Max chunk length
         assert len(second_chunk_words) > 0  # Has remaining words
     
+    def test_get_model_default_backend(self):
+        """The default torch backend loads without passing backend= (ST 2.2.2 lacks it)"""
+        generator = EmbeddingGenerator(device="cpu")
+        with patch('app.services.semantic_service.SentenceTransformer') as mock_st:
+            model = generator._get_model()
+        
+        mock_st.assert_called_once_with(generator.model_name, device="cpu")
+        assert model is mock_st.return_value
+        assert generator._get_model() is model
+    
     def test_get_cache_key(self, embedding_generator):
         """Test cache key generation"""
         text = "test text"
         key1 = embedding_generator._get_cache_key(text)
         key2 = embedding_generator._get_cache_key(text)
         assert key1 == key2
-        assert len(key1) == 32  # MD5 hash length
+        assert len(key1) == 16  # 128-bit BLAKE2b digest
+        assert key1 != embedding_generator._get_cache_key("other text")
     
     @pytest.mark.asyncio
     async def test_generate_embedding_mock(self, embedding_generator):
@@ -62,7 +76,7 @@ class TestEmbeddingGenerator:
         with patch.object(embedding_generator, '_get_model') as mock_model:
             # Mock the sentence transformer model
             mock_transformer = Mock()
-            mock_transformer.encode.return_value = np.array([0.1, 0.2, 0.3])
+            mock_transformer.encode.return_value = np.array([[0.1, 0.2, 0.3]])
             mock_model.return_value = mock_transformer
             
             text = "test text"
@@ -71,6 +85,67 @@ class TestEmbeddingGenerator:
             assert isinstance(embedding, np.ndarray)
             assert embedding.shape == (3,)
             mock_transformer.encode.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_generate_embeddings_batch_single_encode(self, embedding_generator):
+        """Test that several texts, including multi-chunk ones, are encoded in one call"""
+        with patch.object(embedding_generator, '_get_model') as mock_model:
+            mock_transformer = Mock()
+            # "short text" -> 1 chunk, long text -> 2 chunks
+            mock_transformer.encode.return_value = np.array([
+                [1.0, 0.0, 0.0],
+                [0.0, 1.0, 0.0],
+                [0.0, 0.0, 1.0],
+            ])
+            mock_model.return_value = mock_transformer
+            
+            long_text = " ".join(["word"] * 520)
+            embeddings = await embedding_generator.generate_embeddings_batch(["short text", long_text])
+            
+            mock_transformer.encode.assert_called_once()
+            assert len(mock_transformer.encode.call_args[0][0]) == 3
+            np.testing.assert_allclose(embeddings[0], [1.0, 0.0, 0.0])
+            np.testing.assert_allclose(embeddings[1], [0.0, 2 ** -0.5, 2 ** -0.5])
+            
+            # Both are cached now, so a repeat call does not touch the model
+            await embedding_generator.generate_embeddings_batch(["short text", long_text])
+            mock_transformer.encode.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_embedding_cache_evicts_least_recently_used(self):
+        """Test that the embedding cache is bounded and evicts the oldest entry"""
+        generator = EmbeddingGenerator(max_cache_size=2)
+        with patch.object(generator, '_get_model') as mock_model:
+            mock_transformer = Mock()
+            mock_transformer.encode.return_value = np.array([[1.0, 0.0, 0.0]])
+            mock_model.return_value = mock_transformer
+            
+            await generator.generate_embedding("first")
+            await generator.generate_embedding("second")
+            await generator.generate_embedding("first")  # refresh "first"
+            await generator.generate_embedding("third")  # evicts "second"
+            
+            assert len(generator._embedding_cache) == 2
+            assert generator._get_cache_key("second") not in generator._embedding_cache
+            assert generator._get_cache_key("first") in generator._embedding_cache
+
+
+class TestEmbeddingQuantization:
+    """Test int8 embedding quantization helpers"""
+    
+    def test_round_trip(self):
+        """Quantized embeddings stay close to the originals"""
+        e1 = np.array([0.6, 0.8, 0.0], dtype=np.float32)
+        q1, s1 = quantize_embedding(e1)
+        
+        assert q1.dtype == np.int8
+        np.testing.assert_allclose(dequantize_embedding(q1, s1), e1, atol=0.01)
+    
+    def test_zero_vector(self):
+        """A zero vector quantizes without dividing by zero"""
+        q, scale = quantize_embedding(np.zeros(3, dtype=np.float32))
+        assert not q.any()
+        assert scale == 1.0
 
 
 class TestSimilarityCalculator:
@@ -131,6 +206,25 @@ class TestSimilarityCalculator:
         assert "match_quality" in result
         assert "embedding_dimensions" in result
         assert result["embedding_dimensions"] == 3
+    
+    def test_score_many_matches_interpret_similarity(self, similarity_calculator):
+        """Test batch scoring agrees with the single-pair interpretation"""
+        query = np.array([1.0, 0.0, 0.0])
+        candidates = np.array([
+            [1.0, 0.0, 0.0],
+            [0.8, 0.6, 0.0],
+            [0.0, 1.0, 0.0],
+            [-0.8, 0.6, 0.0],
+            [-1.0, 0.0, 0.0],
+        ])
+        
+        result = similarity_calculator.score_many(query, candidates)
+        
+        for i, candidate in enumerate(candidates):
+            expected = similarity_calculator.interpret_similarity(float(candidate @ query))
+            assert abs(result["percentage"][i] - expected["percentage"]) < 1e-6
+            assert result["confidence"][i] == expected["confidence"]
+            assert result["match_quality"][i] == expected["match_quality"]
 
 
 class TestKeywordAnalyzer:
@@ -175,6 +269,22 @@ class TestKeywordAnalyzer:
         coverage = keyword_analyzer.calculate_keyword_coverage(matched, total_job)
         assert coverage == 50.0  # 2/4 * 100
     
+    def test_extract_keywords_cached_by_text(self, keyword_analyzer):
+        """Test that repeated texts skip spaCy via the keyword cache"""
+        keyword_analyzer._nlp = Mock()  # Treat the model as loaded
+        with patch.object(keyword_analyzer, '_extract_noun_phrases_batch') as mock_extract:
+            mock_extract.return_value = [["python"]]
+            
+            first = keyword_analyzer.extract_keywords("Python developer")
+            second = keyword_analyzer.extract_keywords("Python developer")
+            
+            assert first == second
+            assert "py" in first  # Synonym expansion still applied
+            mock_extract.assert_called_once()
+        
+        keyword_analyzer.clear_cache()
+        assert len(keyword_analyzer._keyword_cache) == 0
+    
     def test_prioritize_missing_keywords(self, keyword_analyzer):
         """Test missing keyword prioritization"""
         missing = ["python", "react", "sql"]
@@ -197,12 +307,12 @@ class TestSemanticService:
     async def test_analyze_compatibility_mock(self, semantic_service):
         """Test compatibility analysis with mocked components"""
         # Mock the embedding generator
-        with patch.object(semantic_service.embedding_generator, 'generate_embedding') as mock_embed:
-            mock_embed.return_value = np.array([0.5, 0.5, 0.0])
+        with patch.object(semantic_service.embedding_generator, 'generate_embeddings_batch') as mock_embed:
+            mock_embed.return_value = [np.array([0.5, 0.5, 0.0]), np.array([0.5, 0.5, 0.0])]
             
             # Mock the keyword analyzer
-            with patch.object(semantic_service.keyword_analyzer, 'extract_keywords') as mock_extract:
-                mock_extract.side_effect = [
+            with patch.object(semantic_service.keyword_analyzer, 'extract_keywords_batch') as mock_extract:
+                mock_extract.return_value = [
                     ["python", "javascript"],  # Resume keywords
                     ["python", "react", "sql"]  # Job keywords
                 ]
@@ -223,6 +333,22 @@ class TestSemanticService:
                         assert result.missing_keywords == ["react", "sql"]
                         assert result.keyword_coverage == 33.3
     
+    @pytest.mark.asyncio
+    async def test_embed_coalesces_concurrent_calls(self, semantic_service):
+        """Concurrent embed() calls are served by one batched model call"""
+        with patch.object(semantic_service.embedding_generator, 'generate_embeddings_batch',
+                          new_callable=AsyncMock) as mock_batch:
+            mock_batch.side_effect = lambda texts: [np.array([float(len(t))]) for t in texts]
+            
+            results = await asyncio.gather(
+                semantic_service.embed("a"),
+                semantic_service.embed("bb"),
+                semantic_service.embed("ccc")
+            )
+            
+            mock_batch.assert_called_once_with(["a", "bb", "ccc"])
+            assert [r[0] for r in results] == [1.0, 2.0, 3.0]
+    
     def test_get_service_stats(self, semantic_service):
         """Test service statistics"""
         stats = semantic_service.get_service_stats()
@@ -234,4 +360,25 @@ class TestSemanticService:
     def test_clear_caches(self, semantic_service):
         """Test cache clearing"""
         # This should not raise an exception
-        semantic_service.clear_caches()
\ No newline at end of file
+        semantic_service.clear_caches()
+
+
+class TestGetSemanticService:
+    """Test the shared semantic service accessor"""
+    
+    def test_idle_timer_rearmed_on_new_loop(self):
+        """A timer left behind on a closed loop does not stop the next loop arming one"""
+        import app.services.semantic_service as semantic_module
+        
+        async def access():
+            semantic_module.get_semantic_service()
+            return semantic_module._semantic_service_expiry
+        
+        with patch.object(semantic_module, 'semantic_service', None), \
+             patch.object(semantic_module, '_semantic_service_ref', None), \
+             patch.object(semantic_module, '_semantic_service_expiry', None):
+            first_loop, _ = asyncio.run(access())
+            second_loop, handle = asyncio.run(access())
+            
+            assert second_loop is not first_loop
+            assert not handle.cancelled()
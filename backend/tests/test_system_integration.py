@@ -10,6 +10,7 @@ Requirements: 5.5, 6.6, 7.4, 7.5
 """
 import pytest
 import asyncio
+import dataclasses
 import tempfile
 import os
 import json
@@ -339,7 +340,7 @@ class TestCompleteWorkflowIntegration:
             job_title="Senior Full Stack Developer - AI/ML Platform",
             job_description=job_description,
             match_score=96.8,
-            ai_feedback=mock_feedback.dict(),
+            ai_feedback=dataclasses.asdict(mock_feedback),
             matched_keywords=mock_compatibility.matched_keywords,
             missing_keywords=mock_compatibility.missing_keywords,
             processing_time=2.3,